@@ -138,13 +138,11 @@ async def run_audit_schedule_now(
         )
 
     # Get devices
-    devices = [device_service.get_device_by_id(db, did) for did in device_ids]
-    devices = [d for d in devices if d is not None]
+    devices = device_service.get_devices_by_ids(db, device_ids)
 
     # Determine which rules to use
     if schedule.rule_ids:
-        rules = [rule_service.get_rule_by_id(db, rid) for rid in schedule.rule_ids]
-        rules = [r for r in rules if r is not None]
+        rules = rule_service.get_rules_by_ids(db, schedule.rule_ids)
     else:
         # Use all enabled rules
         rules = rule_service.get_enabled_rules(db)
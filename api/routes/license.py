@@ -125,7 +125,7 @@ async def activate_license(
             # Reactivate existing license
             existing_license.is_active = True
             existing_license.last_validated = datetime.utcnow()
-            db.commit()
+            activated_license = existing_license
 
             logger.info(f"Reactivated existing {existing_license.license_tier} license for {existing_license.customer_email}")
         else:
@@ -148,14 +148,15 @@ async def activate_license(
             )
             
             db.add(new_license)
-            db.commit()
-            db.refresh(new_license)
+            db.flush()  # Assign the id for the audit log row below
+            activated_license = new_license
             
             logger.info(f"Activated new {new_license.license_tier} license for {new_license.customer_email}")
         
-        # Log successful activation
+        # Log successful activation in the same transaction as the activation,
+        # so the license change and its audit row commit together
         log = db_models.LicenseValidationLogDB(
-            license_id=existing_license.id if existing_license else new_license.id,
+            license_id=activated_license.id,
             license_key_attempted=request.license_key[:50],
             validation_result="activated",
             validation_message="License successfully activated",
@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     
     # Database (optional)
     database_url: Optional[str] = None
+
+    # Database connection pool (ignored for SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    # Ping each connection on checkout; turn off behind PgBouncer, which
+    # already drops dead server connections
+    db_pool_pre_ping: bool = True
     
     # Redis (optional)
     redis_url: Optional[str] = None
@@ -30,6 +39,9 @@ class Settings(BaseSettings):
     log_file_max_bytes: int = 10485760  # 10MB
     log_file_backup_count: int = 5
 
+    # Discovery Settings
+    discovery_concurrency: int = 2  # Discovery groups scanned at the same time
+
     # Health Check Settings
     health_check_enabled: bool = True
     health_check_interval_minutes: int = 5  # How often to run health checks
@@ -37,6 +49,7 @@ class Settings(BaseSettings):
     # Config Backup Settings
     config_backup_enabled: bool = True
     config_backup_interval_minutes: int = 360  # How often to run automated config backups (default: hourly)
+    config_backup_concurrency: int = 5  # Devices backed up at the same time
     nokia_backup_format: str = "cli"  # Options: "json" (NETCONF) or "cli" (SSH)
 
     # Security
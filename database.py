@@ -1,3 +1,4 @@
+import json
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -5,10 +6,42 @@ from config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.database_url or "sqlite:///./network_audit.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
+if "sqlite" in SQLALCHEMY_DATABASE_URL:
+    engine_config = {"connect_args": {"check_same_thread": False}}
+else:
+    engine_config = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_use_lifo": True,
+    }
+
+# Prefer orjson for writing JSON columns, fall back to SQLAlchemy's stdlib
+# encoder. Reads stay on the stdlib json.loads, which also accepts the
+# NaN/Infinity tokens older rows may hold (orjson.loads rejects them).
+# orjson writes non-finite floats as null; see
+# migrations/null_non_finite_json_floats.py for existing rows.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(value) -> str:
+    """Serialize a JSON column value, using the stdlib for what orjson rejects"""
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        # e.g. integers wider than 64 bits, which the stdlib round-trips
+        return json.dumps(value)
+
+
+if orjson is not None:
+    engine_config["json_serializer"] = _dump_json
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_config)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -10,12 +10,12 @@ class DeviceDB(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     hostname = Column(String(255), unique=True, index=True, nullable=False)
-    vendor = Column(SQLEnum(VendorType), nullable=False)
+    vendor = Column(SQLEnum(VendorType, native_enum=False, length=32), nullable=False)
     ip = Column(String(45), unique=True, index=True, nullable=True)  # Unique constraint on IP
     port = Column(Integer, default=830)
     username = Column(String(255), nullable=True)
     password = Column(String(255), nullable=True)
-    status = Column(SQLEnum(DeviceStatus), default=DeviceStatus.DISCOVERED)
+    status = Column(SQLEnum(DeviceStatus, native_enum=False, length=32), default=DeviceStatus.DISCOVERED)
     last_audit = Column(DateTime, nullable=True)
     compliance = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -44,7 +44,7 @@ class HardwareInventoryDB(Base):
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), index=True, nullable=False)
+    device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=False)  # Covered by the composite indexes
 
     # Component identification
     component_type = Column(String(50), index=True, nullable=False)  # chassis, card, power, fan, mda
@@ -85,7 +85,7 @@ class AuditRuleDB(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    severity = Column(SQLEnum(SeverityLevel), default=SeverityLevel.MEDIUM)
+    severity = Column(SQLEnum(SeverityLevel, native_enum=False, length=32), default=SeverityLevel.MEDIUM)
     category = Column(String(100), index=True, nullable=True)
     enabled = Column(Boolean, default=True)
     vendors = Column(JSON, nullable=False)  # List of VendorType
@@ -306,7 +306,7 @@ class RuleTemplateDB(Base):
     category = Column(String(100), index=True)  # CIS, PCI-DSS, SOC2, Custom
     framework = Column(String(100), nullable=True)  # Framework name/version
     description = Column(Text)
-    severity = Column(SQLEnum(SeverityLevel), default=SeverityLevel.MEDIUM)
+    severity = Column(SQLEnum(SeverityLevel, native_enum=False, length=32), default=SeverityLevel.MEDIUM)
     vendors = Column(JSON, nullable=False)  # Applicable vendors
     checks = Column(JSON, nullable=False)  # Rule check definitions
     tags = Column(JSON, nullable=True)  # Search tags
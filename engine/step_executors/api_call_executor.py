@@ -5,6 +5,8 @@
 
 import aiohttp
 import asyncio
+import json
+from collections.abc import Mapping
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 import base64
@@ -13,6 +15,20 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Prefer orjson for request bodies, fall back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dump_json_bytes(data: Any) -> bytes:
+    """Serialize a JSON-compatible value straight to UTF-8 bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
 
 class ApiCallExecutor:
     """Execute API call steps - make HTTP requests to external services"""
@@ -33,7 +49,7 @@ class ApiCallExecutor:
         """
         # Render URL template
         url = context.render_template_string(step.api_url)
-        method = step.api_method.upper()
+        method = step.api_method
 
         logger.info(f"Making {method} request to {url}")
 
@@ -66,8 +82,10 @@ class ApiCallExecutor:
         # Prepare request body
         body = None
         if step.api_body:
-            # Recursively render template strings in body
-            body = self._render_dict_templates(step.api_body, context)
+            # Recursively render template strings in body and encode once
+            body = dump_json_bytes(self._render_dict_templates(step.api_body, context))
+            if not any(key.lower() == 'content-type' for key in headers):
+                headers['Content-Type'] = 'application/json'
 
         # Make HTTP request
         timeout = aiohttp.ClientTimeout(total=step.timeout or 30)
@@ -79,7 +97,7 @@ class ApiCallExecutor:
                     url=url,
                     headers=headers,
                     params=params,
-                    json=body if body else None
+                    data=body
                 ) as response:
                     # Get response
                     status_code = response.status
@@ -114,7 +132,7 @@ class ApiCallExecutor:
 
     def _render_dict_templates(self, data: Any, context) -> Any:
         """Recursively render Jinja2 templates in dictionary/list structures"""
-        if isinstance(data, dict):
+        if isinstance(data, Mapping):
             return {k: self._render_dict_templates(v, context) for k, v in data.items()}
         elif isinstance(data, list):
             return [self._render_dict_templates(item, context) for item in data]
@@ -7,7 +7,7 @@ import ast
 import asyncio
 import operator
 import time
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Union
 from datetime import datetime
 from sqlalchemy.orm import Session
 from jinja2 import Template, Environment, BaseLoader
@@ -41,10 +41,13 @@ SAFE_OPERATORS = {
 }
 
 
-def safe_eval(expression: str, context: Dict[str, Any]) -> bool:
-    """Safely evaluate a boolean expression with context variables."""
+def safe_eval(expression: Union[str, ast.Expression], context: Dict[str, Any]) -> bool:
+    """Safely evaluate a boolean expression (source or pre-parsed AST) with context variables."""
     try:
-        tree = ast.parse(expression, mode='eval')
+        if isinstance(expression, ast.Expression):
+            tree = expression
+        else:
+            tree = ast.parse(expression, mode='eval')
         return _eval_node(tree.body, context)
     except Exception:
         return False
@@ -135,14 +138,19 @@ class WorkflowContext:
 
         return template.render(**template_context)
 
-    def evaluate_condition(self, condition: str) -> bool:
-        """Evaluate a condition string safely without using eval()"""
+    def evaluate_condition(self, condition: str, condition_ast: Optional[ast.Expression] = None) -> bool:
+        """
+        Evaluate a condition string safely without using eval()
+
+        condition_ast is the parser's pre-parsed form of a condition without
+        Jinja markup; when given, rendering and re-parsing are skipped.
+        """
         if not condition:
             return True
 
         try:
-            # Render Jinja2 template first
-            rendered = self.render_template_string(condition)
+            # Render Jinja2 template first (pre-parsed conditions have none)
+            rendered = condition if condition_ast is not None else self.render_template_string(condition)
 
             # Simple boolean evaluation
             if rendered.lower() in ['true', '1', 'yes']:
@@ -156,7 +164,7 @@ class WorkflowContext:
                 **self.step_outputs
             }
 
-            return bool(safe_eval(rendered, context))
+            return bool(safe_eval(condition_ast if condition_ast is not None else rendered, context))
         except Exception as e:
             logger.error(f"Error evaluating condition '{condition}': {e}")
             return False
@@ -266,7 +274,7 @@ class WorkflowEngine:
         """Execute steps sequentially in order"""
         for step in workflow.steps:
             # Check if step should be executed (condition)
-            if step.condition and not context.evaluate_condition(step.condition):
+            if step.condition and not context.evaluate_condition(step.condition, step.condition_ast):
                 logger.info(f"Skipping step '{step.name}' - condition not met")
                 self._log_step(execution, step, "skipped", None, None, "Condition not met")
                 continue
@@ -280,29 +288,17 @@ class WorkflowEngine:
         context: WorkflowContext,
         execution: WorkflowExecutionDB
     ):
-        """Execute steps in DAG order with parallel execution where possible"""
-        # Build dependency graph
-        pending_steps = {step.name: step for step in workflow.steps}
-        ready_steps = []
-
-        # Find steps with no dependencies
-        for step in workflow.steps:
-            if not step.depends_on:
-                ready_steps.append(step)
-
-        while ready_steps or pending_steps:
-            if not ready_steps:
-                # Deadlock - circular dependency or missing dependency
-                raise ValueError("Workflow has unresolved dependencies or circular references")
+        """Execute steps in DAG order, running each wave of independent steps in parallel"""
+        steps_by_name = {step.name: step for step in workflow.steps}
 
-            # Execute all ready steps in parallel
+        for wave in workflow.execution_waves:
             tasks = []
-            for step in ready_steps:
+            for step_name in wave:
+                step = steps_by_name[step_name]
                 # Check condition
-                if step.condition and not context.evaluate_condition(step.condition):
+                if step.condition and not context.evaluate_condition(step.condition, step.condition_ast):
                     logger.info(f"Skipping step '{step.name}' - condition not met")
                     self._log_step(execution, step, "skipped", None, None, "Condition not met")
-                    context.executed_steps.add(step.name)
                     continue
 
                 tasks.append(self._execute_step(step, context, execution))
@@ -311,17 +307,7 @@ class WorkflowEngine:
             if tasks:
                 await asyncio.gather(*tasks)
 
-            # Mark ready steps as executed
-            for step in ready_steps:
-                context.executed_steps.add(step.name)
-                if step.name in pending_steps:
-                    del pending_steps[step.name]
-
-            # Find next ready steps
-            ready_steps = []
-            for step_name, step in list(pending_steps.items()):
-                if all(dep in context.executed_steps for dep in step.depends_on):
-                    ready_steps.append(step)
+            context.executed_steps.update(wave)
 
     async def _execute_hybrid(
         self,
@@ -3,13 +3,15 @@
 # main.py - FastAPI Application
 # ============================================================================
 
+import importlib
 import os
+from datetime import datetime
+from functools import lru_cache
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from database import get_db, init_db
-from api.routes import devices, rules, audits, health, discovery_groups, device_groups, audit_schedules, config_backups, notifications, device_import, drift_detection, rule_templates, integrations, admin, remediation, user_management, hardware_inventory, license
 from config import settings
 from utils.logger import setup_logger
 from scheduler.background_scheduler import get_scheduler
@@ -22,70 +24,112 @@ app = FastAPI(
     description="Network Audit Platform with scheduled discovery, device groups, and automated audits"
 )
 
-# Initialize database
-init_db()
-logger.info("Database initialized")
-
-# Start background scheduler
-scheduler = get_scheduler()
+# Routers as (module, prefix, tags). They are imported and included during
+# startup so that importing main.py does not pull in every route module.
+# Routers with prefix None already define their prefix in their own file.
+_ROUTERS = [
+    ("api.routes.devices", "/devices", ["Devices"]),
+    ("api.routes.rules", "/rules", ["Rules"]),
+    ("api.routes.audits", "/audit", ["Audits"]),
+    ("api.routes.health", None, ["Health"]),
+    ("api.routes.discovery_groups", "/discovery-groups", ["Discovery Groups"]),
+    ("api.routes.device_groups", "/device-groups", ["Device Groups"]),
+    ("api.routes.audit_schedules", "/audit-schedules", ["Audit Schedules"]),
+    ("api.routes.config_backups", None, ["Config Backups"]),
+    ("api.routes.notifications", None, ["Notifications"]),
+    ("api.routes.device_import", None, ["Device Import"]),
+    ("api.routes.drift_detection", None, ["Drift Detection"]),
+    ("api.routes.rule_templates", None, ["Rule Templates"]),
+    # Advanced features
+    ("api.routes.integrations", None, ["Integrations"]),
+    # Admin panel
+    ("api.routes.admin", None, ["Admin"]),
+    ("api.routes.user_management", "/user-management", ["User Management"]),
+    ("api.routes.remediation", None, ["Remediation"]),
+    ("api.routes.hardware_inventory", None, ["Hardware Inventory"]),
+    ("api.routes.license", None, ["License"]),
+]
+
+# Default system modules, seeded on startup if missing
+DEFAULT_SYSTEM_MODULES = [
+    {'module_name': 'devices', 'display_name': 'Device Management', 'enabled': True},
+    {'module_name': 'device_groups', 'display_name': 'Device Groups', 'enabled': True},
+    {'module_name': 'discovery_groups', 'display_name': 'Discovery Groups', 'enabled': True},
+    {'module_name': 'device_import', 'display_name': 'Device Import', 'enabled': True},
+    {'module_name': 'audit', 'display_name': 'Audit Results', 'enabled': True},
+    {'module_name': 'audit_schedules', 'display_name': 'Audit Schedules', 'enabled': True},
+    {'module_name': 'rules', 'display_name': 'Rule Management', 'enabled': True},
+    {'module_name': 'rule_templates', 'display_name': 'Rule Templates', 'enabled': True},
+    {'module_name': 'config_backups', 'display_name': 'Config Backups', 'enabled': True},
+    {'module_name': 'drift_detection', 'display_name': 'Drift Detection', 'enabled': True},
+    {'module_name': 'notifications', 'display_name': 'Notifications', 'enabled': True},
+    {'module_name': 'health', 'display_name': 'Device Health', 'enabled': True},
+    {'module_name': 'hardware_inventory', 'display_name': 'Hardware Inventory', 'enabled': True},
+    {'module_name': 'integrations', 'display_name': 'Integration Hub', 'enabled': True},
+    {'module_name': 'ai_chat', 'display_name': 'AI Chat', 'enabled': True},
+    {'module_name': 'ai_rule_builder', 'display_name': 'AI Rule Builder', 'enabled': True},
+    {'module_name': 'ai_remediation', 'display_name': 'AI Remediation', 'enabled': True},
+    {'module_name': 'ai_reports', 'display_name': 'AI Reports', 'enabled': True},
+    {'module_name': 'anomaly_detection', 'display_name': 'Anomaly Detection', 'enabled': True},
+    {'module_name': 'mcp_hub', 'display_name': 'MCP Hub', 'enabled': True},
+]
+
+
+def include_routers(app: FastAPI):
+    """Import and include all API routers from the _ROUTERS table"""
+    for module_path, prefix, tags in _ROUTERS:
+        router = importlib.import_module(module_path).router
+        if prefix:
+            app.include_router(router, prefix=prefix, tags=tags)
+        else:
+            app.include_router(router, tags=tags)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Start background scheduler and initialize system modules on application startup"""
-    # Initialize system modules if empty
+    """Include routers, initialize system modules and start background scheduler on application startup"""
+    include_routers(app)
+
+    # Schema creation normally runs once out-of-band before deploy; creating
+    # it here in every worker is opt-in
+    if os.getenv("NAP_INIT_DB") == "1":
+        init_db()
+        logger.info("Database initialized")
+
+    # Seed any missing default system modules in one idempotent statement
     from db_models import SystemModuleDB
     db = next(get_db())
     try:
-        module_count = db.query(SystemModuleDB).count()
-        if module_count == 0:
-            logger.info("Initializing system modules with default configuration")
-            default_modules = [
-                {'module_name': 'devices', 'display_name': 'Device Management', 'enabled': True},
-                {'module_name': 'device_groups', 'display_name': 'Device Groups', 'enabled': True},
-                {'module_name': 'discovery_groups', 'display_name': 'Discovery Groups', 'enabled': True},
-                {'module_name': 'device_import', 'display_name': 'Device Import', 'enabled': True},
-                {'module_name': 'audit', 'display_name': 'Audit Results', 'enabled': True},
-                {'module_name': 'audit_schedules', 'display_name': 'Audit Schedules', 'enabled': True},
-                {'module_name': 'rules', 'display_name': 'Rule Management', 'enabled': True},
-                {'module_name': 'rule_templates', 'display_name': 'Rule Templates', 'enabled': True},
-                {'module_name': 'config_backups', 'display_name': 'Config Backups', 'enabled': True},
-                {'module_name': 'drift_detection', 'display_name': 'Drift Detection', 'enabled': True},
-                {'module_name': 'notifications', 'display_name': 'Notifications', 'enabled': True},
-                {'module_name': 'health', 'display_name': 'Device Health', 'enabled': True},
-                {'module_name': 'hardware_inventory', 'display_name': 'Hardware Inventory', 'enabled': True},
-                {'module_name': 'integrations', 'display_name': 'Integration Hub', 'enabled': True},
-                {'module_name': 'ai_chat', 'display_name': 'AI Chat', 'enabled': True},
-                {'module_name': 'ai_rule_builder', 'display_name': 'AI Rule Builder', 'enabled': True},
-                {'module_name': 'ai_remediation', 'display_name': 'AI Remediation', 'enabled': True},
-                {'module_name': 'ai_reports', 'display_name': 'AI Reports', 'enabled': True},
-                {'module_name': 'anomaly_detection', 'display_name': 'Anomaly Detection', 'enabled': True},
-                {'module_name': 'mcp_hub', 'display_name': 'MCP Hub', 'enabled': True},
-            ]
-
-            for module_data in default_modules:
-                module = SystemModuleDB(**module_data)
-                db.add(module)
-
-            db.commit()
-            logger.info(f"Initialized {len(default_modules)} system modules")
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(SystemModuleDB).values(DEFAULT_SYSTEM_MODULES).on_conflict_do_nothing(
+            index_elements=['module_name']
+        )
+        result = db.execute(stmt)
+        db.commit()
+        if result.rowcount:
+            logger.info(f"Initialized {result.rowcount} system modules")
         else:
-            logger.info(f"System modules already configured ({module_count} modules)")
+            logger.info("System modules already configured")
     except Exception as e:
         logger.error(f"Failed to initialize system modules: {e}")
         db.rollback()
     finally:
         db.close()
 
-    # Start background scheduler
-    scheduler.start()
+    # Build the scheduler only now: its backup job reads system_config, which
+    # doesn't exist on a fresh database until init_db() above has run
+    get_scheduler().start()
     logger.info("Application started with background scheduler")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Stop background scheduler on application shutdown"""
-    scheduler.shutdown()
+    get_scheduler().shutdown()
     logger.info("Application shutdown complete")
 
 # CORS middleware
@@ -99,33 +143,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(devices.router, prefix="/devices", tags=["Devices"])
-app.include_router(rules.router, prefix="/rules", tags=["Rules"])
-app.include_router(audits.router, prefix="/audit", tags=["Audits"])
-app.include_router(health.router, tags=["Health"])
-app.include_router(discovery_groups.router, prefix="/discovery-groups", tags=["Discovery Groups"])
-app.include_router(device_groups.router, prefix="/device-groups", tags=["Device Groups"])
-app.include_router(audit_schedules.router, prefix="/audit-schedules", tags=["Audit Schedules"])
-# These routers already have prefixes defined in their files
-app.include_router(config_backups.router, tags=["Config Backups"])
-app.include_router(notifications.router, tags=["Notifications"])
-app.include_router(device_import.router, tags=["Device Import"])
-app.include_router(drift_detection.router, tags=["Drift Detection"])
-app.include_router(rule_templates.router, tags=["Rule Templates"])
-# Advanced features
-app.include_router(integrations.router, tags=["Integrations"])
-# Admin panel
-app.include_router(admin.router, tags=["Admin"])
-# User Management
-app.include_router(user_management.router, prefix="/user-management", tags=["User Management"])
-# Remediation
-app.include_router(remediation.router, tags=["Remediation"])
-# Hardware Inventory
-app.include_router(hardware_inventory.router, tags=["Hardware Inventory"])
-# License Management
-app.include_router(license.router, tags=["License"])
-
 # Mount frontend static files (if they exist)
 try:
     app.mount("/app", StaticFiles(directory="frontend/build", html=True), name="frontend")
@@ -168,27 +185,34 @@ async def root():
         ]
     }
 
+@lru_cache(maxsize=None)
+def _health_counts_query():
+    """Build the health-check COUNT(*) statement once and reuse it for every request"""
+    from sqlalchemy import select, func
+    from db_models import DeviceDB, AuditRuleDB, AuditResultDB
+
+    return select(
+        select(func.count(DeviceDB.id)).scalar_subquery().label("devices"),
+        select(func.count(AuditRuleDB.id)).scalar_subquery().label("rules"),
+        select(func.count(AuditRuleDB.id)).where(AuditRuleDB.enabled == True).scalar_subquery().label("enabled_rules"),
+        select(func.count(AuditResultDB.id)).scalar_subquery().label("audit_results"),
+    )
+
+
 @app.get("/api/health-check")
 async def health_check(db: Session = Depends(get_db)):
     """Detailed health check with database stats"""
-    from services.device_service import DeviceService
-    from services.rule_service import RuleService
-    from services.audit_service import AuditService
-    from engine.audit_engine import AuditEngine
-    from datetime import datetime
-
-    device_service = DeviceService()
-    rule_service = RuleService()
-    audit_service = AuditService(AuditEngine())
+    # Count everything in one round-trip instead of loading full tables
+    counts = db.execute(_health_counts_query()).one()
 
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "database": "connected",
-        "devices": len(device_service.get_all_devices(db)),
-        "rules": len(rule_service.get_all_rules(db)),
-        "enabled_rules": len(rule_service.get_enabled_rules(db)),
-        "audit_results": len(audit_service.get_all_results(db))
+        "devices": counts.devices,
+        "rules": counts.rules,
+        "enabled_rules": counts.enabled_rules,
+        "audit_results": counts.audit_results
     }
 
 if __name__ == "__main__":
@@ -197,6 +221,9 @@ if __name__ == "__main__":
     logger.info(f"Starting {settings.api_title} v{settings.api_version}")
     logger.info(f"Listening on {settings.api_host}:{settings.api_port}")
 
+    init_db()
+    logger.info("Database initialized")
+
     uvicorn.run(
         app,
         host=settings.api_host,
@@ -0,0 +1,43 @@
+"""
+Migration: Add covering indexes for the analytics dashboard queries
+
+- compliance_trends (device_id, snapshot_date DESC) serves the previous
+  snapshot lookup, the trend windows and the 7-day average; on PostgreSQL it
+  INCLUDEs the compliance figures so those reads are index-only.
+- compliance_anomalies (device_id, detected_at DESC) WHERE NOT acknowledged
+  serves the per-device open-anomaly lists while skipping handled rows.
+- compliance_anomalies (detected_at DESC) WHERE NOT acknowledged serves the
+  dashboard's fleet-wide "open anomalies in the last 7 days" count.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_index(
+        'ix_compliance_trends_device_date',
+        'compliance_trends',
+        ['device_id', sa.text('snapshot_date DESC')],
+        postgresql_include=['overall_compliance', 'compliance_change'],
+    )
+    op.create_index(
+        'ix_compliance_anomalies_unacked',
+        'compliance_anomalies',
+        ['device_id', sa.text('detected_at DESC')],
+        postgresql_include=['severity', 'anomaly_type'],
+        postgresql_where=sa.text('acknowledged = false'),
+        sqlite_where=sa.text('acknowledged = 0'),
+    )
+    op.create_index(
+        'ix_compliance_anomalies_pending',
+        'compliance_anomalies',
+        [sa.text('detected_at DESC')],
+        postgresql_where=sa.text('acknowledged = false'),
+        sqlite_where=sa.text('acknowledged = 0'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_compliance_anomalies_pending', table_name='compliance_anomalies')
+    op.drop_index('ix_compliance_anomalies_unacked', table_name='compliance_anomalies')
+    op.drop_index('ix_compliance_trends_device_date', table_name='compliance_trends')
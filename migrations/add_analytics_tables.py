@@ -3,82 +3,111 @@ Migration: Add analytics tables (compliance_trends, compliance_forecasts, compli
 """
 from alembic import op
 import sqlalchemy as sa
-from datetime import datetime
+
+# (index name, table, columns, append-only timestamp column)
+ANALYTICS_INDEXES = (
+    ('ix_compliance_trends_id', 'compliance_trends', ('id',), False),
+    ('ix_compliance_trends_snapshot_date', 'compliance_trends', ('snapshot_date',), True),
+    ('ix_compliance_trends_device_id', 'compliance_trends', ('device_id',), False),
+    ('ix_compliance_forecasts_id', 'compliance_forecasts', ('id',), False),
+    ('ix_compliance_forecasts_date', 'compliance_forecasts', ('forecast_date',), True),
+    ('ix_compliance_forecasts_device_id', 'compliance_forecasts', ('device_id',), False),
+    ('ix_compliance_anomalies_id', 'compliance_anomalies', ('id',), False),
+    ('ix_compliance_anomalies_detected_at', 'compliance_anomalies', ('detected_at',), True),
+    ('ix_compliance_anomalies_device_acknowledged', 'compliance_anomalies', ('device_id', 'acknowledged'), False),
+)
+
+# Smaller ranges than the default 128 keep BRIN lookups tight on recent data
+BRIN_PAGES_PER_RANGE = 32
+
+
+def _index_ddl(postgresql):
+    """
+    Build CREATE INDEX statements for the analytics tables.
+
+    On PostgreSQL the append-only timestamp columns get BRIN indexes, which
+    are a fraction of the size of a B-tree for monotonically growing values.
+    """
+    for name, table, columns, time_ordered in ANALYTICS_INDEXES:
+        if postgresql and time_ordered:
+            yield (f"CREATE INDEX {name} ON {table} USING brin ({', '.join(columns)}) "
+                   f"WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})")
+        else:
+            yield f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
 
 
 def upgrade():
-    # Create compliance_trends table
-    op.create_table(
-        'compliance_trends',
-        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
-        sa.Column('snapshot_date', sa.DateTime(), nullable=False),
-        sa.Column('device_id', sa.Integer(), nullable=True),
-        sa.Column('overall_compliance', sa.Float(), default=0.0),
-        sa.Column('compliance_change', sa.Float(), default=0.0),
-        sa.Column('total_devices', sa.Integer(), default=0),
-        sa.Column('compliant_devices', sa.Integer(), default=0),
-        sa.Column('failed_devices', sa.Integer(), default=0),
-        sa.Column('total_checks', sa.Integer(), default=0),
-        sa.Column('passed_checks', sa.Integer(), default=0),
-        sa.Column('failed_checks', sa.Integer(), default=0),
-        sa.Column('warning_checks', sa.Integer(), default=0),
-        sa.Column('critical_failures', sa.Integer(), default=0),
-        sa.Column('high_failures', sa.Integer(), default=0),
-        sa.Column('medium_failures', sa.Integer(), default=0),
-        sa.Column('low_failures', sa.Integer(), default=0),
-        sa.Column('created_at', sa.DateTime(), default=datetime.utcnow),
-        sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='SET NULL'),
-    )
+    bind = op.get_bind()
+
+    # Run all three tables and their indexes as one unit: a single commit on
+    # a bare connection, or a savepoint inside Alembic's migration transaction
+    with (bind.begin_nested() if bind.in_transaction() else bind.begin()):
+        # Create compliance_trends table
+        op.create_table(
+            'compliance_trends',
+            sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+            sa.Column('snapshot_date', sa.DateTime(), nullable=False),
+            sa.Column('device_id', sa.Integer(), nullable=True),
+            sa.Column('overall_compliance', sa.Float(), default=0.0),
+            sa.Column('compliance_change', sa.Float(), default=0.0),
+            sa.Column('total_devices', sa.Integer(), default=0),
+            sa.Column('compliant_devices', sa.Integer(), default=0),
+            sa.Column('failed_devices', sa.Integer(), default=0),
+            sa.Column('total_checks', sa.Integer(), default=0),
+            sa.Column('passed_checks', sa.Integer(), default=0),
+            sa.Column('failed_checks', sa.Integer(), default=0),
+            sa.Column('warning_checks', sa.Integer(), default=0),
+            sa.Column('critical_failures', sa.Integer(), default=0),
+            sa.Column('high_failures', sa.Integer(), default=0),
+            sa.Column('medium_failures', sa.Integer(), default=0),
+            sa.Column('low_failures', sa.Integer(), default=0),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='SET NULL'),
+        )
 
-    # Create indexes for compliance_trends
-    op.create_index('ix_compliance_trends_id', 'compliance_trends', ['id'])
-    op.create_index('ix_compliance_trends_snapshot_date', 'compliance_trends', ['snapshot_date'])
-    op.create_index('ix_compliance_trends_device_id', 'compliance_trends', ['device_id'])
 
-    # Create compliance_forecasts table
-    op.create_table(
-        'compliance_forecasts',
-        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
-        sa.Column('forecast_date', sa.DateTime(), nullable=False),
-        sa.Column('device_id', sa.Integer(), nullable=True),
-        sa.Column('predicted_compliance', sa.Float(), default=0.0),
-        sa.Column('confidence_score', sa.Float(), default=0.0),
-        sa.Column('predicted_failures', sa.Integer(), default=0),
-        sa.Column('model_version', sa.String(50), default='linear_regression_v1'),
-        sa.Column('training_data_points', sa.Integer(), default=0),
-        sa.Column('created_at', sa.DateTime(), default=datetime.utcnow),
-        sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='SET NULL'),
-    )
+        # Create compliance_forecasts table
+        op.create_table(
+            'compliance_forecasts',
+            sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+            sa.Column('forecast_date', sa.DateTime(), nullable=False),
+            sa.Column('device_id', sa.Integer(), nullable=True),
+            sa.Column('predicted_compliance', sa.Float(), default=0.0),
+            sa.Column('confidence_score', sa.Float(), default=0.0),
+            sa.Column('predicted_failures', sa.Integer(), default=0),
+            sa.Column('model_version', sa.String(50), default='linear_regression_v1'),
+            sa.Column('training_data_points', sa.Integer(), default=0),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='SET NULL'),
+        )
 
-    # Create indexes for compliance_forecasts
-    op.create_index('ix_compliance_forecasts_id', 'compliance_forecasts', ['id'])
-    op.create_index('ix_compliance_forecasts_date', 'compliance_forecasts', ['forecast_date'])
-    op.create_index('ix_compliance_forecasts_device_id', 'compliance_forecasts', ['device_id'])
 
-    # Create compliance_anomalies table
-    op.create_table(
-        'compliance_anomalies',
-        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
-        sa.Column('device_id', sa.Integer(), nullable=True),
-        sa.Column('detected_at', sa.DateTime(), default=datetime.utcnow),
-        sa.Column('anomaly_type', sa.String(100), nullable=False),
-        sa.Column('severity', sa.String(20), nullable=False),
-        sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('z_score', sa.Float(), nullable=True),
-        sa.Column('expected_value', sa.Float(), nullable=True),
-        sa.Column('actual_value', sa.Float(), nullable=True),
-        sa.Column('acknowledged', sa.Boolean(), default=False),
-        sa.Column('acknowledged_by', sa.String(100), nullable=True),
-        sa.Column('acknowledged_at', sa.DateTime(), nullable=True),
-        sa.Column('resolution_notes', sa.Text(), nullable=True),
-        sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='CASCADE'),
-    )
+        # Create compliance_anomalies table
+        op.create_table(
+            'compliance_anomalies',
+            sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+            sa.Column('device_id', sa.Integer(), nullable=True),
+            sa.Column('detected_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.Column('anomaly_type', sa.String(100), nullable=False),
+            sa.Column('severity', sa.String(20), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('z_score', sa.Float(), nullable=True),
+            sa.Column('expected_value', sa.Float(), nullable=True),
+            sa.Column('actual_value', sa.Float(), nullable=True),
+            sa.Column('acknowledged', sa.Boolean(), default=False),
+            sa.Column('acknowledged_by', sa.String(100), nullable=True),
+            sa.Column('acknowledged_at', sa.DateTime(), nullable=True),
+            sa.Column('resolution_notes', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='CASCADE'),
+        )
 
-    # Create indexes for compliance_anomalies
-    op.create_index('ix_compliance_anomalies_id', 'compliance_anomalies', ['id'])
-    op.create_index('ix_compliance_anomalies_detected_at', 'compliance_anomalies', ['detected_at'])
-    op.create_index('ix_compliance_anomalies_device_id', 'compliance_anomalies', ['device_id'])
-    op.create_index('ix_compliance_anomalies_device_acknowledged', 'compliance_anomalies', ['device_id', 'acknowledged'])
+        # Create all indexes in one round trip on PostgreSQL; other backends
+        # (SQLite) only accept one statement per execute
+        if bind.dialect.name == 'postgresql':
+            op.execute(";\n".join(_index_ddl(postgresql=True)))
+        else:
+            for statement in _index_ddl(postgresql=False):
+                op.execute(statement)
 
 
 def downgrade():
@@ -11,6 +11,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 
+# PRAGMA user_version stamped once this migration has been applied
+SCHEMA_VERSION = 3
+
+# (column name, column definition) added to devices by this migration
+BACKOFF_COLUMNS = (
+    ("consecutive_failures", "INTEGER DEFAULT 0"),
+    ("last_check_attempt", "DATETIME"),
+    ("next_check_due", "DATETIME"),
+)
+
 
 def upgrade():
     """Add exponential backoff tracking columns"""
@@ -20,41 +30,38 @@ def upgrade():
     cursor = conn.cursor()
 
     try:
+        # PRAGMA user_version is only a fast path for re-running this exact
+        # migration; these scripts can run in any order, so a higher stamp
+        # says nothing about this one and the schema check below decides
+        cursor.execute("PRAGMA user_version")
+        user_version = cursor.fetchone()[0]
+        if user_version == SCHEMA_VERSION:
+            print("⊘ Migration already applied")
+            return
+
         # Check if columns already exist
         cursor.execute("PRAGMA table_info(devices)")
-        columns = [col[1] for col in cursor.fetchall()]
-
-        if 'consecutive_failures' not in columns:
-            print("Adding consecutive_failures column...")
-            cursor.execute("""
-                ALTER TABLE devices
-                ADD COLUMN consecutive_failures INTEGER DEFAULT 0
-            """)
-            print("✓ Added consecutive_failures column")
-        else:
-            print("⊘ consecutive_failures column already exists")
-
-        if 'last_check_attempt' not in columns:
-            print("Adding last_check_attempt column...")
-            cursor.execute("""
-                ALTER TABLE devices
-                ADD COLUMN last_check_attempt DATETIME
-            """)
-            print("✓ Added last_check_attempt column")
-        else:
-            print("⊘ last_check_attempt column already exists")
-
-        if 'next_check_due' not in columns:
-            print("Adding next_check_due column...")
-            cursor.execute("""
-                ALTER TABLE devices
-                ADD COLUMN next_check_due DATETIME
-            """)
-            print("✓ Added next_check_due column")
-        else:
-            print("⊘ next_check_due column already exists")
-
-        conn.commit()
+        columns = {col[1] for col in cursor.fetchall()}
+
+        missing = [(name, ddl) for name, ddl in BACKOFF_COLUMNS if name not in columns]
+        for name, _ in BACKOFF_COLUMNS:
+            if name in columns:
+                print(f"⊘ {name} column already exists")
+
+        if missing:
+            print(f"Adding {', '.join(name for name, _ in missing)} column(s)...")
+            # One transaction for all ALTERs instead of a schema change per column
+            cursor.executescript(
+                "BEGIN; "
+                + " ".join(f"ALTER TABLE devices ADD COLUMN {name} {ddl};" for name, ddl in missing)
+                + " COMMIT;"
+            )
+            for name, _ in missing:
+                print(f"✓ Added {name} column")
+
+        # Never move the stamp backwards past a later migration's version
+        if user_version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         print("\n✅ Migration completed successfully!")
 
     except Exception as e:
@@ -12,6 +12,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 
+# PRAGMA user_version stamped once this migration has been applied
+SCHEMA_VERSION = 4
+
 
 def upgrade():
     """Add excluded_ips column to discovery_groups"""
@@ -21,11 +24,18 @@ def upgrade():
     cursor = conn.cursor()
 
     try:
-        # Check if column already exists
-        cursor.execute("PRAGMA table_info(discovery_groups)")
-        columns = [col[1] for col in cursor.fetchall()]
+        # PRAGMA user_version is only a fast path for re-running this exact
+        # migration; these scripts can run in any order, so a higher stamp
+        # says nothing about this one and the schema check below decides
+        cursor.execute("PRAGMA user_version")
+        user_version = cursor.fetchone()[0]
+        if user_version == SCHEMA_VERSION:
+            print("⊘ Migration already applied")
+            return
 
-        if 'excluded_ips' not in columns:
+        # Attempt the ALTER directly; SQLite reports an existing column as
+        # "duplicate column name", which saves a PRAGMA table_info probe
+        try:
             print("Adding excluded_ips column...")
             # SQLite doesn't support adding JSON columns directly with DEFAULT
             # We'll add as TEXT and set default to empty list JSON
@@ -34,9 +44,14 @@ def upgrade():
                 ADD COLUMN excluded_ips TEXT DEFAULT '[]'
             """)
             print("✓ Added excluded_ips column")
-        else:
+        except sqlite3.OperationalError as e:
+            if "duplicate column" not in str(e).lower():
+                raise
             print("⊘ excluded_ips column already exists")
 
+        # Never move the stamp backwards past a later migration's version
+        if user_version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
         print("\n✅ Migration completed successfully!")
 
@@ -3,7 +3,6 @@ Migration: Add hardware_inventory table
 """
 from alembic import op
 import sqlalchemy as sa
-from datetime import datetime
 
 
 def upgrade():
@@ -27,15 +26,14 @@ def upgrade():
         sa.Column('manufacturing_date', sa.String(50), nullable=True),
         sa.Column('clei_code', sa.String(50), nullable=True),
         sa.Column('is_fru', sa.Boolean(), default=False),
-        sa.Column('last_discovered', sa.DateTime(), default=datetime.utcnow),
-        sa.Column('created_at', sa.DateTime(), default=datetime.utcnow),
+        sa.Column('last_discovered', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
         sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['parent_id'], ['hardware_inventory.id'], ondelete='CASCADE'),
     )
 
     # Create indexes
     op.create_index('ix_hardware_inventory_id', 'hardware_inventory', ['id'])
-    op.create_index('ix_hardware_inventory_device_id', 'hardware_inventory', ['device_id'])
     op.create_index('ix_hardware_inventory_component_type', 'hardware_inventory', ['component_type'])
     op.create_index('ix_hardware_device_type', 'hardware_inventory', ['device_id', 'component_type'])
     op.create_index('ix_hardware_device_slot', 'hardware_inventory', ['device_id', 'slot_number'])
@@ -18,25 +18,68 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
 from database import engine, Base
 from db_models import LicenseDB, LicenseValidationLogDB
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+MIGRATION_ID = "license_system_v1"
+
+# Applied-migration markers, so repeat runs skip the per-table catalog probes
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(100), primary_key=True),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
+
+def _already_applied():
+    """Check for this migration's marker with a single primary-key lookup"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(schema_migrations.c.version).where(schema_migrations.c.version == MIGRATION_ID)
+            ).first() is not None
+    except (OperationalError, ProgrammingError):
+        # schema_migrations doesn't exist yet
+        return False
+
 
 def run_migration():
     """Create license system tables"""
     try:
         logger.info("Starting license system migration...")
         
-        # Create tables
-        LicenseDB.__table__.create(engine, checkfirst=True)
-        logger.info("✓ Created 'licenses' table")
-        
-        LicenseValidationLogDB.__table__.create(engine, checkfirst=True)
-        logger.info("✓ Created 'license_validation_logs' table")
-        
+        if _already_applied():
+            logger.info("⊘ License system migration already applied")
+            return
+
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # Create tables and record the marker in one transaction; IF NOT EXISTS
+        # DDL replaces a checkfirst catalog probe per table
+        with engine.begin() as conn:
+            for table in (schema_migrations, LicenseDB.__table__, LicenseValidationLogDB.__table__):
+                conn.execute(CreateTable(table, if_not_exists=True))
+                for index in table.indexes:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+                logger.info(f"✓ Created '{table.name}' table")
+
+            conn.execute(
+                insert(schema_migrations).values(version=MIGRATION_ID).on_conflict_do_nothing(
+                    index_elements=["version"]
+                )
+            )
+
         logger.info("✅ License system migration completed successfully")
         
         print("\n" + "="*80)
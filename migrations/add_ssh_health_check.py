@@ -11,6 +11,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 
+# PRAGMA user_version stamped once this migration has been applied
+SCHEMA_VERSION = 5
+
+# (column name, column definition) added to health_checks by this migration
+SSH_COLUMNS = (
+    ("ssh_status", "BOOLEAN DEFAULT 0"),
+    ("ssh_message", "TEXT"),
+)
+
 
 def upgrade():
     """Add SSH health check columns"""
@@ -20,31 +29,38 @@ def upgrade():
     cursor = conn.cursor()
 
     try:
+        # PRAGMA user_version is only a fast path for re-running this exact
+        # migration; these scripts can run in any order, so a higher stamp
+        # says nothing about this one and the schema check below decides
+        cursor.execute("PRAGMA user_version")
+        user_version = cursor.fetchone()[0]
+        if user_version == SCHEMA_VERSION:
+            print("⊘ Migration already applied")
+            return
+
         # Check if columns already exist
         cursor.execute("PRAGMA table_info(health_checks)")
-        columns = [col[1] for col in cursor.fetchall()]
-
-        if 'ssh_status' not in columns:
-            print("Adding ssh_status column...")
-            cursor.execute("""
-                ALTER TABLE health_checks
-                ADD COLUMN ssh_status BOOLEAN DEFAULT 0
-            """)
-            print("✓ Added ssh_status column")
-        else:
-            print("⊘ ssh_status column already exists")
-
-        if 'ssh_message' not in columns:
-            print("Adding ssh_message column...")
-            cursor.execute("""
-                ALTER TABLE health_checks
-                ADD COLUMN ssh_message TEXT
-            """)
-            print("✓ Added ssh_message column")
-        else:
-            print("⊘ ssh_message column already exists")
-
-        conn.commit()
+        columns = {col[1] for col in cursor.fetchall()}
+
+        missing = [(name, ddl) for name, ddl in SSH_COLUMNS if name not in columns]
+        for name, _ in SSH_COLUMNS:
+            if name in columns:
+                print(f"⊘ {name} column already exists")
+
+        if missing:
+            print(f"Adding {', '.join(name for name, _ in missing)} column(s)...")
+            # One transaction for all ALTERs instead of a schema change per column
+            cursor.executescript(
+                "BEGIN; "
+                + " ".join(f"ALTER TABLE health_checks ADD COLUMN {name} {ddl};" for name, ddl in missing)
+                + " COMMIT;"
+            )
+            for name, _ in missing:
+                print(f"✓ Added {name} column")
+
+        # Never move the stamp backwards past a later migration's version
+        if user_version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         print("\n✅ Migration completed successfully!")
 
     except Exception as e:
@@ -0,0 +1,73 @@
+"""
+Migration: Convert append-only analytics tables to TimescaleDB hypertables
+
+compliance_trends and compliance_anomalies are keyed by an ever-growing
+timestamp and are read in recent time windows by the analytics dashboards.
+Hypertables partition them into time chunks so those range scans only touch
+recent chunks. Older compliance_trends chunks are compressed per device;
+compliance_anomalies rows are updated when acknowledged, so its chunks stay
+uncompressed.
+
+The time column becomes part of the primary key, so rows without one are
+backfilled first.
+
+Only runs on PostgreSQL servers that ship the timescaledb extension (e.g. the
+timescale/timescaledb image); the stock postgres image and SQLite skip it.
+"""
+from alembic import op
+
+
+# (table, time column, chunk interval, value for NULL time columns, compress)
+HYPERTABLES = (
+    ('compliance_trends', 'snapshot_date', '7 days', 'COALESCE(created_at, now())', True),
+    # acknowledge_anomaly UPDATEs existing rows, which compressed chunks
+    # reject (TimescaleDB < 2.11) or have to decompress for
+    ('compliance_anomalies', 'detected_at', '7 days', 'now()', False),
+)
+
+# Chunks older than this are compressed, segmented by device
+COMPRESS_AFTER = '30 days'
+
+
+def _timescale_available(bind):
+    """Check the server can load timescaledb"""
+    if bind.dialect.name != 'postgresql':
+        return False
+    return bind.exec_driver_sql(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"
+    ).scalar() is not None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not _timescale_available(bind):
+        print("⊘ TimescaleDB not available, keeping plain tables")
+        return
+
+    statements = ["CREATE EXTENSION IF NOT EXISTS timescaledb"]
+    for table, time_column, chunk_interval, null_fill, compress in HYPERTABLES:
+        statements.extend([
+            # The time column joins the primary key, which requires NOT NULL
+            f"UPDATE {table} SET {time_column} = {null_fill} WHERE {time_column} IS NULL",
+            f"ALTER TABLE {table} ALTER COLUMN {time_column} SET NOT NULL",
+            # Hypertable unique keys must include the partitioning column
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_pkey",
+            f"ALTER TABLE {table} ADD PRIMARY KEY (id, {time_column})",
+            f"SELECT create_hypertable('{table}', '{time_column}', "
+            f"chunk_time_interval => INTERVAL '{chunk_interval}', "
+            f"migrate_data => true, if_not_exists => true)",
+        ])
+        if compress:
+            statements.extend([
+                f"ALTER TABLE {table} SET (timescaledb.compress, "
+                f"timescaledb.compress_segmentby = 'device_id')",
+                f"SELECT add_compression_policy('{table}', INTERVAL '{COMPRESS_AFTER}', "
+                f"if_not_exists => true)",
+            ])
+
+    op.execute(";\n".join(statements))
+
+
+def downgrade():
+    print("Note: hypertables cannot be converted back in place.")
+    print("To downgrade, copy the data into plain tables and swap them in.")
@@ -0,0 +1,62 @@
+"""
+Migration: Rebuild analytics timestamp indexes as BRIN on PostgreSQL
+
+Databases created through create_all (or before add_analytics_tables used
+BRIN) carry B-tree indexes on the append-only snapshot_date, forecast_date
+and detected_at columns. BRIN indexes on such insert-ordered columns are a
+tiny fraction of the size and cost almost nothing to maintain on insert.
+SQLite keeps its B-tree indexes.
+"""
+from alembic import op
+
+
+# Smaller ranges than the default 128 keep BRIN lookups tight on recent data
+BRIN_PAGES_PER_RANGE = 32
+
+# (table, column); index names differ between the service models, so every
+# single-column index on these columns is replaced
+TIME_COLUMNS = (
+    ('compliance_trends', 'snapshot_date'),
+    ('compliance_forecasts', 'forecast_date'),
+    ('compliance_anomalies', 'detected_at'),
+)
+
+# Find single-column B-tree indexes on a column in one catalog query
+_BTREE_INDEXES_SQL = """
+    SELECT i.relname
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_class t ON t.oid = x.indrelid
+    JOIN pg_am am ON am.oid = i.relam
+    JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = x.indkey[0]
+    WHERE t.relname = %(table)s AND a.attname = %(column)s
+      AND x.indnatts = 1 AND am.amname = 'btree' AND NOT x.indisunique
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("⊘ Not PostgreSQL, keeping B-tree indexes")
+        return
+
+    statements = []
+    for table, column in TIME_COLUMNS:
+        names = [row[0] for row in bind.exec_driver_sql(
+            _BTREE_INDEXES_SQL, {'table': table, 'column': column}
+        )]
+        if not names:
+            continue
+        statements.extend(f"DROP INDEX IF EXISTS {name}" for name in names)
+        statements.append(
+            f"CREATE INDEX {names[0]} ON {table} USING brin ({column}) "
+            f"WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})"
+        )
+
+    if statements:
+        op.execute(";\n".join(statements))
+
+
+def downgrade():
+    print("Note: BRIN indexes are left in place; recreate B-tree indexes")
+    print("manually if point lookups on these columns are needed.")
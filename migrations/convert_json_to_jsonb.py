@@ -0,0 +1,45 @@
+"""
+Migration: Store JSON columns as JSONB on PostgreSQL
+
+Plain json columns are kept as text and reparsed on every access; jsonb is
+stored pre-parsed, so reading values out of it is cheaper.
+
+SQLAlchemy's JSON type reads and writes jsonb columns unchanged, so the
+models need no change. The models still declare generic JSON, so filters
+such as .contains() compile to LIKE rather than jsonb @>; no GIN indexes
+are created, since no query could use them. SQLite databases are skipped.
+"""
+from alembic import op
+
+
+# Convert every remaining json column in the public schema in one round trip
+CONVERT_JSON_COLUMNS = """
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND data_type = 'json'
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE %I ALTER COLUMN %I TYPE jsonb USING %I::jsonb',
+            col.table_name, col.column_name, col.column_name
+        );
+    END LOOP;
+END $$
+"""
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        print("⊘ Not PostgreSQL, JSON columns left as-is")
+        return
+
+    op.execute(CONVERT_JSON_COLUMNS)
+
+
+def downgrade():
+    print("Note: columns are left as jsonb; devices.metadata was created as")
+    print("jsonb, so converting every jsonb column back to json is not safe.")
@@ -0,0 +1,58 @@
+"""
+Migration: Store enum columns as VARCHAR instead of native PostgreSQL ENUMs
+
+vendor, status and severity were created as native ENUM types, so adding a
+vendor or status meant an ALTER TYPE on a live table. The models now declare
+them with native_enum=False, which keeps the same stored values (the enum
+member names) in a plain VARCHAR(32) column validated by the application.
+
+Which tables use the types depends on the services that ran create_all
+(e.g. compliance_anomalies.severity), so the columns are looked up in
+information_schema rather than listed here; columns that are already
+VARCHAR are left alone.
+
+SQLite already stores these as VARCHAR and is skipped.
+"""
+from alembic import op
+
+
+# Native enum types created by create_all for the VendorType, DeviceStatus
+# and SeverityLevel columns
+ENUM_TYPES = ('vendortype', 'devicestatus', 'severitylevel')
+
+# Convert every column still using one of the types, then drop the types,
+# in one round trip
+CONVERT_ENUM_COLUMNS = """
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND udt_name IN ({enum_types})
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE %I ALTER COLUMN %I TYPE VARCHAR(32) USING %I::text',
+            col.table_name, col.column_name, col.column_name
+        );
+    END LOOP;
+END $$
+"""
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        print("⊘ Not PostgreSQL, enum columns are already VARCHAR")
+        return
+
+    statements = [
+        CONVERT_ENUM_COLUMNS.format(enum_types=", ".join(f"'{t}'" for t in ENUM_TYPES))
+    ]
+    statements.extend(f"DROP TYPE IF EXISTS {enum_type}" for enum_type in ENUM_TYPES)
+    op.execute(";\n".join(statements))
+
+
+def downgrade():
+    print("Note: native ENUM types are not recreated. To downgrade, CREATE TYPE")
+    print("each enum from the model members and ALTER the columns back USING it.")
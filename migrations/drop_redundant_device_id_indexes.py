@@ -0,0 +1,26 @@
+"""
+Migration: Drop single-column device_id indexes covered by composites
+
+hardware_inventory.device_id leads ix_hardware_device_type and
+ix_hardware_device_slot, and compliance_anomalies.device_id leads
+ix_compliance_anomalies_device_acknowledged, so the standalone device_id
+indexes only add write cost on every insert.
+"""
+from alembic import op
+
+
+# (index name, table, column)
+REDUNDANT_INDEXES = (
+    ('ix_hardware_inventory_device_id', 'hardware_inventory', 'device_id'),
+    ('ix_compliance_anomalies_device_id', 'compliance_anomalies', 'device_id'),
+)
+
+
+def upgrade():
+    for name, _, _ in REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def downgrade():
+    for name, table, column in REDUNDANT_INDEXES:
+        op.create_index(name, table, [column])
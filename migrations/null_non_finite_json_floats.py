@@ -0,0 +1,115 @@
+"""
+Migration: Replace NaN/Infinity in JSON columns with null
+
+JSON columns used to be written with the stdlib encoder, which emits the
+non-standard NaN, Infinity and -Infinity tokens for non-finite floats. They
+are now written with orjson, which stores those values as null, so this
+rewrites existing rows the same way and keeps old and new rows consistent.
+
+Only SQLite can hold such rows: PostgreSQL's json/jsonb input rejects the
+tokens, so those writes never succeeded there.
+"""
+import json
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import database config
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+
+# Columns declared as TEXT rather than JSON that hold JSON column data
+EXTRA_JSON_COLUMNS = (
+    ("devices", "metadata"),
+)
+
+
+def _null_non_finite(value):
+    """Return value with non-finite floats replaced by None"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _null_non_finite(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_null_non_finite(v) for v in value]
+    return value
+
+
+def _json_columns(cursor):
+    """(table, column) pairs for every JSON column in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    tables = [row[0] for row in cursor.fetchall()]
+
+    columns = []
+    for table in tables:
+        cursor.execute(f'PRAGMA table_info("{table}")')
+        for col in cursor.fetchall():
+            if col[2].upper() == "JSON" or (table, col[1]) in EXTRA_JSON_COLUMNS:
+                columns.append((table, col[1]))
+    return columns
+
+
+def upgrade():
+    """Rewrite JSON values containing non-finite floats"""
+    database_url = settings.database_url or "sqlite:///./network_audit.db"
+    if not database_url.startswith("sqlite"):
+        print("⊘ Not SQLite, JSON columns cannot hold NaN/Infinity")
+        return
+
+    db_path = database_url.replace('sqlite:///', '')
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        updated = 0
+        for table, column in _json_columns(cursor):
+            # Only rows containing one of the tokens can need a rewrite
+            cursor.execute(
+                f'SELECT rowid, "{column}" FROM "{table}" '
+                f'WHERE "{column}" LIKE \'%NaN%\' OR "{column}" LIKE \'%Infinity%\''
+            )
+            for rowid, raw in cursor.fetchall():
+                try:
+                    value = json.loads(raw)
+                except (TypeError, ValueError):
+                    continue
+                cleaned = _null_non_finite(value)
+                # NaN != NaN, so compare the encoded forms
+                new_raw = json.dumps(cleaned)
+                if new_raw != json.dumps(value):
+                    conn.execute(
+                        f'UPDATE "{table}" SET "{column}" = ? WHERE rowid = ?',
+                        (new_raw, rowid)
+                    )
+                    updated += 1
+                    print(f"✓ {table}.{column} row {rowid}")
+
+        conn.commit()
+        print(f"\n✅ Migration completed: {updated} value(s) rewritten")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def downgrade():
+    """Non-finite values are not restored"""
+    print("Note: the original NaN/Infinity values are not kept, so this")
+    print("migration cannot be reversed.")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Migration: Replace NaN/Infinity in JSON columns with null")
+    print("=" * 60)
+    print()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -3,10 +3,17 @@
 # ============================================================================
 
 import asyncio
+import json
+import time
+import traceback
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, Optional
+from sqlalchemy.orm import Session
 from database import SessionLocal
+from db_models import SystemConfigDB
 from services.discovery_group_service import DiscoveryGroupService
 from services.device_service import DeviceService
 from services.discovery_service import DiscoveryService
@@ -18,7 +25,7 @@ from services.health_service import HealthService
 from services.config_backup_service import ConfigBackupService
 from engine.audit_engine import AuditEngine
 from models.device import Device
-from models.enums import VendorType
+from models.discovery_group import DiscoveryGroup
 from utils.logger import setup_logger
 from utils.crypto import decrypt_password
 from config import settings
@@ -32,6 +39,7 @@ discovery_service = DiscoveryService()
 audit_schedule_service = AuditScheduleService()
 device_group_service = DeviceGroupService()
 rule_service = RuleService()
+audit_service = AuditService(AuditEngine())
 health_service = HealthService()
 
 
@@ -39,39 +47,49 @@ async def run_scheduled_discoveries():
     """Check for and run scheduled discoveries"""
     db = SessionLocal()
     try:
-        groups = discovery_group_service.get_scheduled_groups(db)
-        logger.info(f"Found {len(groups)} discovery groups due to run")
+        scheduled = discovery_group_service.get_scheduled_groups_with_passwords(db)
+        logger.info(f"Found {len(scheduled)} discovery groups due to run")
+    except Exception as e:
+        logger.error(f"Error in run_scheduled_discoveries: {str(e)}")
+        return
+    finally:
+        db.close()
 
-        for group in groups:
-            try:
-                # Get decrypted password
-                password = discovery_group_service.get_decrypted_password(db, group.id)
-
-                # Run discovery
-                logger.info(f"Running discovery for group: {group.name}")
-                discovered = await discovery_service.discover_subnet(
-                    subnet=group.subnet,
-                    username=group.username,
-                    password=password,
-                    port=group.port,
-                    excluded_ips=group.excluded_ips
-                )
-
-                # Merge discovered devices
-                added_count = device_service.merge_discovered_devices(db, discovered)
+    # Scan due groups concurrently, bounded so overlapping subnet sweeps
+    # don't flood the network
+    semaphore = asyncio.Semaphore(settings.discovery_concurrency)
+    await asyncio.gather(*(
+        _run_discovery_group(group, password, semaphore) for group, password in scheduled
+    ))
+
+
+async def _run_discovery_group(group: DiscoveryGroup, password: str, semaphore: asyncio.Semaphore):
+    """Discover and merge one group on its own session (sessions can't be shared across tasks)"""
+    async with semaphore:
+        db = SessionLocal()
+        try:
+            # Run discovery
+            logger.info(f"Running discovery for group: {group.name}")
+            discovered = await discovery_service.discover_subnet(
+                subnet=group.subnet,
+                username=group.username,
+                password=password,
+                port=group.port,
+                excluded_ips=group.excluded_ips
+            )
 
-                # Update timestamps
-                discovery_group_service.update_run_timestamps(db, group.id)
+            # Merge discovered devices
+            added_count = device_service.merge_discovered_devices(db, discovered)
 
-                logger.info(f"Discovery group '{group.name}': found {len(discovered)}, added {added_count}")
+            # Update timestamps
+            discovery_group_service.update_run_timestamps(db, group.id)
 
-            except Exception as e:
-                logger.error(f"Error running discovery for group {group.id}: {str(e)}")
+            logger.info(f"Discovery group '{group.name}': found {len(discovered)}, added {added_count}")
 
-    except Exception as e:
-        logger.error(f"Error in run_scheduled_discoveries: {str(e)}")
-    finally:
-        db.close()
+        except Exception as e:
+            logger.error(f"Error running discovery for group {group.id}: {str(e)}")
+        finally:
+            db.close()
 
 
 async def run_scheduled_audits():
@@ -99,13 +117,11 @@ async def run_scheduled_audits():
                     continue
 
                 # Get devices
-                devices = [device_service.get_device_by_id(db, did) for did in device_ids]
-                devices = [d for d in devices if d is not None]
+                devices = device_service.get_devices_by_ids(db, device_ids)
 
                 # Determine which rules to use
                 if schedule.rule_ids:
-                    rules = [rule_service.get_rule_by_id(db, rid) for rid in schedule.rule_ids]
-                    rules = [r for r in rules if r is not None]
+                    rules = rule_service.get_rules_by_ids(db, schedule.rule_ids)
                 else:
                     # Use all enabled rules
                     rules = rule_service.get_enabled_rules(db)
@@ -113,8 +129,6 @@ async def run_scheduled_audits():
                 logger.info(f"Running audit for schedule: {schedule.name} ({len(devices)} devices, {len(rules)} rules)")
 
                 # Run audit
-                audit_engine = AuditEngine()
-                audit_service = AuditService(audit_engine)
                 await audit_service.execute_audit(db, devices, rules)
 
                 # Update timestamps
@@ -131,6 +145,28 @@ async def run_scheduled_audits():
         db.close()
 
 
+def _decrypt_devices(devices_db: list[Device]) -> list[Device]:
+    """Rebuild Device models with decrypted passwords, skipping any that fail"""
+    devices = []
+    for device_db in devices_db:
+        try:
+            decrypted_pwd = decrypt_password(device_db.password) if device_db.password else None
+            # Fields were already validated by DeviceService, so skip revalidating
+            device = Device.model_construct(
+                id=device_db.id,
+                hostname=device_db.hostname,
+                vendor=device_db.vendor,
+                ip=device_db.ip,
+                port=device_db.port,
+                username=device_db.username,
+                password=decrypted_pwd
+            )
+            devices.append(device)
+        except Exception as e:
+            logger.error(f"Error converting device {device_db.hostname}: {str(e)}")
+    return devices
+
+
 async def run_health_checks():
     """Run health checks on all devices"""
     if not settings.health_check_enabled:
@@ -138,32 +174,15 @@ async def run_health_checks():
 
     db = SessionLocal()
     try:
-        # Get all devices
-        devices_db = device_service.get_all_devices(db)
-        logger.info(f"Running health checks for {len(devices_db)} devices")
-
-        # Convert to Device models - decrypt passwords for health checks
-        devices = []
-        for device_db in devices_db:
-            try:
-                decrypted_pwd = decrypt_password(device_db.password) if device_db.password else None
-                device = Device(
-                    id=device_db.id,
-                    hostname=device_db.hostname,
-                    vendor=VendorType(device_db.vendor),
-                    ip=device_db.ip,
-                    port=device_db.port,
-                    username=device_db.username,
-                    password=decrypted_pwd
-                )
-                devices.append(device)
-            except Exception as e:
-                logger.error(f"Error converting device {device_db.hostname}: {str(e)}")
+        # Work through the fleet a chunk at a time instead of loading every device
+        checked_count = 0
+        for devices_db in device_service.iter_all_devices(db):
+            devices = _decrypt_devices(devices_db)
+            if devices:
+                results = await health_service.check_all_devices_health(db, devices)
+                checked_count += len(results)
 
-        # Run health checks
-        if devices:
-            results = await health_service.check_all_devices_health(db, devices)
-            logger.info(f"Health checks completed: {len(results)} devices checked")
+        logger.info(f"Health checks completed: {checked_count} devices checked")
 
     except Exception as e:
         logger.error(f"Error in run_health_checks: {str(e)}")
@@ -171,88 +190,97 @@ async def run_health_checks():
         db.close()
 
 
-def get_backup_config_from_db():
-    """Get backup configuration from database"""
-    import json
-    db = SessionLocal()
+# Backup config rarely changes, so keep the parsed value for a short while
+# instead of querying on every scheduler tick
+BACKUP_CONFIG_TTL_SECONDS = 60
+_backup_config_cache = {"value": None, "expires": 0.0}
+
+
+def get_backup_config_from_db(db: Optional[Session] = None):
+    """
+    Get backup configuration from database (cached for BACKUP_CONFIG_TTL_SECONDS)
+
+    Reads on the caller's session when one is given, otherwise opens its own.
+    """
+    if time.monotonic() < _backup_config_cache["expires"]:
+        return _backup_config_cache["value"]
+
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
     try:
         # Try to get config from SystemConfigDB
-        from db_models import SystemConfigDB
         config = db.query(SystemConfigDB).filter(
             SystemConfigDB.key == "backup_config"
         ).first()
 
-        if config:
-            return json.loads(config.value)
-        return None
+        value = json.loads(config.value) if config else None
+        _backup_config_cache.update(value=value, expires=time.monotonic() + BACKUP_CONFIG_TTL_SECONDS)
+        return value
     except Exception as e:
         logger.debug(f"Could not get backup config from DB: {e}")
         return None
     finally:
-        db.close()
+        if owns_session:
+            db.close()
+
+
+def invalidate_backup_config_cache():
+    """Force the next get_backup_config_from_db() call to re-read the database"""
+    _backup_config_cache["expires"] = 0.0
+
+
+_SCHEDULE_MINUTES: Mapping[str, int] = MappingProxyType({
+    "hourly": 60,
+    "every6hours": 360,
+    "every12hours": 720,
+    "daily": 1440,
+    "weekly": 10080,
+    "monthly": 43200
+})
 
 
 def schedule_type_to_minutes(schedule_type: str) -> int:
     """Convert schedule type to minutes"""
-    mapping = {
-        "hourly": 60,
-        "every6hours": 360,
-        "every12hours": 720,
-        "daily": 1440,
-        "weekly": 10080,
-        "monthly": 43200
-    }
-    return mapping.get(schedule_type, 60)  # Default to hourly
+    return _SCHEDULE_MINUTES.get(schedule_type, 60)  # Default to hourly
 
 
 async def run_config_backups():
     """Run automated config backups on all devices"""
-    # Check database config first, then fall back to settings
-    db_config = get_backup_config_from_db()
-    if db_config and not db_config.get('enabled', True):
-        logger.debug("Config backups disabled in admin settings")
-        return
-
-    if not db_config and not settings.config_backup_enabled:
-        return
-
     db = SessionLocal()
     try:
-        # Get all devices
-        devices_db = device_service.get_all_devices(db)
-        logger.info(f"Running config backups for {len(devices_db)} devices")
-
-        # Convert to Device models and backup each device - decrypt passwords
+        # Check database config first, then fall back to settings
+        db_config = get_backup_config_from_db(db)
+        if db_config and not db_config.get('enabled', True):
+            logger.debug("Config backups disabled in admin settings")
+            return
+
+        if not db_config and not settings.config_backup_enabled:
+            return
+
+        # Back up devices concurrently, bounded so a large fleet doesn't open
+        # a connection to every device at once
+        semaphore = asyncio.Semaphore(settings.config_backup_concurrency)
         backup_count = 0
-        for device_db in devices_db:
-            try:
-                decrypted_pwd = decrypt_password(device_db.password) if device_db.password else None
-                device = Device(
-                    id=device_db.id,
-                    hostname=device_db.hostname,
-                    vendor=VendorType(device_db.vendor),
-                    ip=device_db.ip,
-                    port=device_db.port,
-                    username=device_db.username,
-                    password=decrypted_pwd
-                )
-
-                # Create backup
-                backup = await ConfigBackupService.backup_device(
-                    db=db,
-                    device=device,
-                    backup_type='auto',
-                    created_by='scheduler'
-                )
-
-                if backup:
+        device_count = 0
+        failures = {"count": 0, "samples": []}
+
+        # Work through the fleet a chunk at a time instead of loading every device
+        for devices_db in device_service.iter_all_devices(db):
+            device_count += len(devices_db)
+            devices = _decrypt_devices(devices_db)
+            tasks = [asyncio.create_task(_backup_device(device, semaphore, failures)) for device in devices]
+
+            # Count each backup as it lands rather than after the whole chunk
+            for finished in asyncio.as_completed(tasks):
+                if await finished:
                     backup_count += 1
-                    logger.info(f"Backup created for device: {device.hostname}")
 
-            except Exception as e:
-                logger.exception(f"Error backing up device {device_db.hostname}: {str(e)}")
+            logger.info(f"Config backups in progress: {backup_count}/{device_count} devices backed up so far")
 
-        logger.info(f"Config backups completed: {backup_count}/{len(devices_db)} devices backed up")
+        logger.info(f"Config backups completed: {backup_count}/{device_count} devices backed up")
+        if failures["count"]:
+            _log_backup_failures(failures)
 
     except Exception as e:
         logger.error(f"Error in run_config_backups: {str(e)}")
@@ -260,11 +288,56 @@ async def run_config_backups():
         db.close()
 
 
+# Tracebacks kept per backup run for the failure summary
+BACKUP_FAILURE_SAMPLES = 3
+
+
+def _log_backup_failures(failures: dict):
+    """Log one summary for a backup run's failures with a few sample tracebacks"""
+    samples = "\n".join(failures["samples"])
+    logger.error(
+        f"Config backups failed for {failures['count']} devices; "
+        f"first {len(failures['samples'])} tracebacks:\n{samples}"
+    )
+
+
+async def _backup_device(device: Device, semaphore: asyncio.Semaphore,
+                         failures: dict) -> bool:
+    """Back up one device on its own session (sessions can't be shared across tasks)"""
+    async with semaphore:
+        db = SessionLocal()
+        try:
+            backup = await ConfigBackupService.backup_device(
+                db=db,
+                device=device,
+                backup_type='auto',
+                created_by='scheduler'
+            )
+
+            if backup:
+                logger.info(f"Backup created for device: {device.hostname}")
+                return True
+            return False
+
+        except Exception as e:
+            # Tracebacks are reported once per run; an outage can fail thousands.
+            # Only a few are formatted, and no exception (or its frames) is kept
+            logger.error(f"Error backing up device {device.hostname}: {e!r}")
+            failures["count"] += 1
+            if len(failures["samples"]) < BACKUP_FAILURE_SAMPLES:
+                failures["samples"].append(f"{device.hostname}:\n{traceback.format_exc()}")
+            return False
+        finally:
+            db.close()
+
+
 class BackgroundScheduler:
     """Background scheduler for running periodic tasks"""
 
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
+        # Interval the config_backup job is currently scheduled at (None if not scheduled)
+        self._backup_interval_minutes = None
         self._setup_jobs()
 
     def _setup_jobs(self):
@@ -317,6 +390,7 @@ class BackgroundScheduler:
                     self.scheduler.remove_job('config_backup')
                 except:
                     pass
+                self._backup_interval_minutes = None
                 return
 
             interval_minutes = schedule_type_to_minutes(db_config.get('scheduleType', 'daily'))
@@ -327,6 +401,12 @@ class BackgroundScheduler:
                 return
             interval_minutes = settings.config_backup_interval_minutes
 
+        # Saving unrelated admin settings shouldn't reschedule (and so restart
+        # the countdown of) a backup job that is already on this interval
+        if interval_minutes == self._backup_interval_minutes and self.scheduler.get_job('config_backup'):
+            logger.debug(f"Config backup already scheduled every {interval_minutes} minutes")
+            return
+
         self.scheduler.add_job(
             run_config_backups,
             trigger=IntervalTrigger(minutes=interval_minutes),
@@ -334,10 +414,12 @@ class BackgroundScheduler:
             name='Run automated config backups',
             replace_existing=True
         )
+        self._backup_interval_minutes = interval_minutes
         logger.info(f"Config backup scheduled every {interval_minutes} minutes")
 
     def reload_backup_schedule(self):
         """Reload backup schedule from database (called when admin updates settings)"""
+        invalidate_backup_config_cache()
         self._setup_backup_job()
 
     def start(self):
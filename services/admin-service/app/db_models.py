@@ -10,12 +10,12 @@ class DeviceDB(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     hostname = Column(String(255), unique=True, index=True, nullable=False)
-    vendor = Column(SQLEnum(VendorType), nullable=False)
+    vendor = Column(SQLEnum(VendorType, native_enum=False, length=32), nullable=False)
     ip = Column(String(45), unique=True, index=True, nullable=True)  # Unique constraint on IP
     port = Column(Integer, default=830)
     username = Column(String(255), nullable=True)
     password = Column(String(255), nullable=True)
-    status = Column(SQLEnum(DeviceStatus), default=DeviceStatus.DISCOVERED)
+    status = Column(SQLEnum(DeviceStatus, native_enum=False, length=32), default=DeviceStatus.DISCOVERED)
     last_audit = Column(DateTime, nullable=True)
     compliance = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -40,7 +40,7 @@ class HardwareInventoryDB(Base):
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), index=True, nullable=False)
+    device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=False)  # Covered by the composite indexes
 
     # Component identification
     component_type = Column(String(50), index=True, nullable=False)  # chassis, card, power, fan, mda
@@ -81,7 +81,7 @@ class AuditRuleDB(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    severity = Column(SQLEnum(SeverityLevel), default=SeverityLevel.MEDIUM)
+    severity = Column(SQLEnum(SeverityLevel, native_enum=False, length=32), default=SeverityLevel.MEDIUM)
     category = Column(String(100), index=True, nullable=True)
     enabled = Column(Boolean, default=True)
     vendors = Column(JSON, nullable=False)  # List of VendorType
@@ -302,7 +302,7 @@ class RuleTemplateDB(Base):
     category = Column(String(100), index=True)  # CIS, PCI-DSS, SOC2, Custom
     framework = Column(String(100), nullable=True)  # Framework name/version
     description = Column(Text)
-    severity = Column(SQLEnum(SeverityLevel), default=SeverityLevel.MEDIUM)
+    severity = Column(SQLEnum(SeverityLevel, native_enum=False, length=32), default=SeverityLevel.MEDIUM)
     vendors = Column(JSON, nullable=False)  # Applicable vendors
     checks = Column(JSON, nullable=False)  # Rule check definitions
     tags = Column(JSON, nullable=True)  # Search tags
@@ -556,10 +556,13 @@ class ComplianceTrendDB(Base):
     __tablename__ = "compliance_trends"
     __table_args__ = (
         Index('ix_compliance_trends_device_snapshot', 'device_id', 'snapshot_date'),
+        # BRIN: append-only timestamp, physically correlated with insert order
+        Index('ix_compliance_trends_snapshot_date', 'snapshot_date',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    snapshot_date = Column(DateTime, default=datetime.utcnow, index=True)
+    snapshot_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=True)  # NULL = overall
     
     # Compliance metrics
@@ -593,10 +596,12 @@ class ComplianceForecastDB(Base):
     __tablename__ = "compliance_forecasts"
     __table_args__ = (
         Index('ix_compliance_forecasts_device_date', 'device_id', 'forecast_date'),
+        Index('ix_compliance_forecasts_forecast_date', 'forecast_date',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    forecast_date = Column(DateTime, index=True, nullable=False)
+    forecast_date = Column(DateTime, nullable=False)
     device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=True)  # NULL = overall
     
     # Predictions
@@ -617,15 +622,17 @@ class ComplianceAnomalyDB(Base):
     __tablename__ = "compliance_anomalies"
     __table_args__ = (
         Index('ix_compliance_anomalies_device_detected', 'device_id', 'detected_at'),
+        Index('ix_compliance_anomalies_detected_at', 'detected_at',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
     id = Column(Integer, primary_key=True, index=True)
     device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=True)  # NULL = overall
-    detected_at = Column(DateTime, default=datetime.utcnow, index=True)
+    detected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Anomaly details
     anomaly_type = Column(String(100), nullable=False)  # compliance_drop, spike_failures, etc.
-    severity = Column(SQLEnum(SeverityLevel), default=SeverityLevel.MEDIUM)
+    severity = Column(SQLEnum(SeverityLevel, native_enum=False, length=32), default=SeverityLevel.MEDIUM)
     description = Column(Text, nullable=False)
     
     # Statistical data
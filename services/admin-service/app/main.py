@@ -7,6 +7,7 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 import sys
 import os
+import json
 from shared.database import get_db, init_db
 from shared.config import settings
 from shared.logger import setup_logger
@@ -47,10 +48,67 @@ def check_security_configuration():
         logger.warning("=" * 80)
 
 
+# system_config table and index, sent as a single multi-statement batch
+SYSTEM_CONFIG_DDL = """
+    CREATE TABLE IF NOT EXISTS system_config (
+        id SERIAL PRIMARY KEY,
+        key VARCHAR(100) UNIQUE NOT NULL,
+        value TEXT NOT NULL,
+        description VARCHAR(255),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_system_config_key ON system_config(key);
+"""
+
+# Default system_config rows, built once and bound in a single executemany
+DEFAULT_SYSTEM_CONFIGS = [
+    {
+        'key': 'backup_config',
+        'value': json.dumps({
+            'enabled': True,
+            'scheduleType': 'daily',
+            'scheduleTime': '02:00',
+            'retentionDays': 30,
+            'maxBackupsPerDevice': 10,
+            'compressBackups': True,
+            'notifyOnFailure': True
+        }),
+        'description': 'Automatic backup configuration'
+    },
+    {
+        'key': 'system_settings',
+        'value': json.dumps({
+            'platformName': 'Network Audit Platform',
+            'smtpEnabled': False,
+            'smtpServer': None,
+            'smtpPort': 587,
+            'smtpUsername': None,
+            'smtpPassword': None,
+            'defaultSessionTimeout': 3600,
+            'enableAuditLogs': True,
+            'maxFailedLogins': 5
+        }),
+        'description': 'General system settings'
+    },
+    {
+        'key': 'notification_settings',
+        'value': json.dumps({
+            'emailEnabled': True,
+            'emailRecipients': [],
+            'notifyOnBackupFailure': True,
+            'notifyOnLicenseExpiry': True,
+            'notifyOnQuotaExceeded': True,
+            'notifyOnAuditFailure': True
+        }),
+        'description': 'Email notification settings'
+    }
+]
+
+
 def run_migrations(db):
     """Run database migrations automatically on startup"""
     from sqlalchemy import text
-    import json
 
     try:
         # Check if system_config table exists
@@ -65,73 +123,18 @@ def run_migrations(db):
 
         logger.info("📦 Running migration: 001_add_system_config_table.sql")
 
-        # Create system_config table
-        db.execute(text("""
-            CREATE TABLE IF NOT EXISTS system_config (
-                id SERIAL PRIMARY KEY,
-                key VARCHAR(100) UNIQUE NOT NULL,
-                value TEXT NOT NULL,
-                description VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
+        # One-shot, re-runnable migration: skip the WAL flush wait on commit
+        db.execute(text("SET LOCAL synchronous_commit TO OFF"))
+
+        # Create system_config table and its index in one round trip
+        db.execute(text(SYSTEM_CONFIG_DDL))
 
-        # Create index
+        # Insert all defaults with a single executemany
         db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_system_config_key ON system_config(key)
-        """))
-
-        # Insert default configurations
-        default_configs = [
-            {
-                'key': 'backup_config',
-                'value': json.dumps({
-                    'enabled': True,
-                    'scheduleType': 'daily',
-                    'scheduleTime': '02:00',
-                    'retentionDays': 30,
-                    'maxBackupsPerDevice': 10,
-                    'compressBackups': True,
-                    'notifyOnFailure': True
-                }),
-                'description': 'Automatic backup configuration'
-            },
-            {
-                'key': 'system_settings',
-                'value': json.dumps({
-                    'platformName': 'Network Audit Platform',
-                    'smtpEnabled': False,
-                    'smtpServer': None,
-                    'smtpPort': 587,
-                    'smtpUsername': None,
-                    'smtpPassword': None,
-                    'defaultSessionTimeout': 3600,
-                    'enableAuditLogs': True,
-                    'maxFailedLogins': 5
-                }),
-                'description': 'General system settings'
-            },
-            {
-                'key': 'notification_settings',
-                'value': json.dumps({
-                    'emailEnabled': True,
-                    'emailRecipients': [],
-                    'notifyOnBackupFailure': True,
-                    'notifyOnLicenseExpiry': True,
-                    'notifyOnQuotaExceeded': True,
-                    'notifyOnAuditFailure': True
-                }),
-                'description': 'Email notification settings'
-            }
-        ]
-
-        for config in default_configs:
-            db.execute(text("""
-                INSERT INTO system_config (key, value, description)
-                VALUES (:key, :value, :description)
-                ON CONFLICT (key) DO NOTHING
-            """), config)
+            INSERT INTO system_config (key, value, description)
+            VALUES (:key, :value, :description)
+            ON CONFLICT (key) DO NOTHING
+        """), DEFAULT_SYSTEM_CONFIGS)
 
         db.commit()
 
@@ -354,5 +357,7 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=3005,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
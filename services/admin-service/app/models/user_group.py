@@ -59,13 +59,22 @@ class Permission:
     MANAGE_SYSTEM = "manage_system"
     VIEW_LOGS = "view_logs"
 
+    # Filled in once below the class body
+    ALL: frozenset = frozenset()
+    _ORDERED: tuple = ()
+
     @classmethod
     def all_permissions(cls):
         """Get all available permissions"""
-        return [
-            getattr(cls, attr) for attr in dir(cls)
-            if not attr.startswith('_') and isinstance(getattr(cls, attr), str)
-        ]
+        return list(cls._ORDERED)
+
+
+# Permissions are static, so collect them once instead of scanning dir() per call
+Permission._ORDERED = tuple(
+    value for name, value in sorted(vars(Permission).items())
+    if not name.startswith('_') and isinstance(value, str)
+)
+Permission.ALL = frozenset(Permission._ORDERED)
 
 
 # ============================================================================
@@ -110,11 +119,12 @@ class UserGroup(UserGroupBase):
 
 class UserBase(BaseModel):
     username: str
-    email: EmailStr
+    email: str  # Validated as EmailStr on the write models only
     full_name: Optional[str] = None
 
 
 class UserCreate(UserBase):
+    email: EmailStr
     password: str
     is_active: bool = True
     is_superuser: bool = False
@@ -4,6 +4,7 @@
 # ============================================================================
 
 from typing import List, Optional, Set
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from datetime import datetime
@@ -294,13 +295,14 @@ class UserGroupService:
         db_user = db.query(UserDB).filter(UserDB.id == user_id).first()
         if db_user and db_user.is_superuser:
             logger.debug(f"[GET_USER_PERMS] User {user_id} is superuser - granting all permissions")
-            return set(Permission.all_permissions())
+            return set(Permission.ALL)
 
         # Get user's groups
-        memberships = db.query(UserGroupMembershipDB).filter(
-            UserGroupMembershipDB.user_id == user_id
-        ).all()
-        group_ids = [m.group_id for m in memberships]
+        group_ids = [
+            group_id for (group_id,) in db.query(UserGroupMembershipDB.group_id).filter(
+                UserGroupMembershipDB.user_id == user_id
+            )
+        ]
 
         logger.info(f"[GET_USER_PERMS] User {user_id} belongs to groups: {group_ids}")
 
@@ -309,12 +311,13 @@ class UserGroupService:
             return set()
 
         # Get all permissions from all groups
-        permissions = db.query(GroupPermissionDB).filter(
+        # Select only the names; the set dedupes across groups
+        permissions = db.query(GroupPermissionDB.permission).filter(
             GroupPermissionDB.group_id.in_(group_ids),
             GroupPermissionDB.granted == True
-        ).all()
+        )
 
-        result = set(p.permission for p in permissions)
+        result = {permission for (permission,) in permissions}
         logger.info(f"[GET_USER_PERMS] User {user_id} permissions from groups {group_ids}: {result}")
 
         return result
@@ -368,10 +371,11 @@ class UserGroupService:
             return license_modules
 
         # For regular users, get their group-based module access
-        memberships = db.query(UserGroupMembershipDB).filter(
-            UserGroupMembershipDB.user_id == user_id
-        ).all()
-        group_ids = [m.group_id for m in memberships]
+        group_ids = [
+            group_id for (group_id,) in db.query(UserGroupMembershipDB.group_id).filter(
+                UserGroupMembershipDB.user_id == user_id
+            )
+        ]
 
         logger.info(f"[GET_USER_MODULES] User {user_id} belongs to groups: {group_ids}")
 
@@ -380,12 +384,12 @@ class UserGroupService:
             return set()
 
         # Get all module access from all groups (these may be frontend route names)
-        module_access = db.query(GroupModuleAccessDB).filter(
+        module_access = db.query(GroupModuleAccessDB.module_name).filter(
             GroupModuleAccessDB.group_id.in_(group_ids),
             GroupModuleAccessDB.can_access == True
-        ).all()
+        )
 
-        group_modules_raw = set(m.module_name for m in module_access)
+        group_modules_raw = {module_name for (module_name,) in module_access}
 
         # Convert frontend route names to backend license module names
         # e.g., "audit" -> "manual_audits", "rules" -> "basic_rules"
@@ -421,11 +425,12 @@ class UserGroupService:
 
         logger.info(f"[UPDATE_PERMS] Deleted {deleted_count} existing permissions for group {group_id}")
 
-        # Add new permissions
-        for permission in permissions:
-            perm = GroupPermissionDB(group_id=group_id, permission=permission, granted=True)
-            db.add(perm)
-            logger.debug(f"[UPDATE_PERMS] Added permission '{permission}' to group {group_id}")
+        # Add new permissions in one executemany INSERT
+        if permissions:
+            db.execute(insert(GroupPermissionDB), [
+                {"group_id": group_id, "permission": permission, "granted": True}
+                for permission in permissions
+            ])
 
         logger.info(f"[UPDATE_PERMS] Added {len(permissions)} new permissions for group {group_id}")
         db.flush()
@@ -439,11 +444,12 @@ class UserGroupService:
 
         logger.info(f"[UPDATE_MODULES] Deleted {deleted_count} existing modules for group {group_id}")
 
-        # Add new module access
-        for module in modules:
-            access = GroupModuleAccessDB(group_id=group_id, module_name=module, can_access=True)
-            db.add(access)
-            logger.debug(f"[UPDATE_MODULES] Added module '{module}' to group {group_id}")
+        # Add new module access in one executemany INSERT
+        if modules:
+            db.execute(insert(GroupModuleAccessDB), [
+                {"group_id": group_id, "module_name": module, "can_access": True}
+                for module in modules
+            ])
 
         logger.info(f"[UPDATE_MODULES] Added {len(modules)} new modules for group {group_id}")
         db.flush()
@@ -469,7 +475,8 @@ class UserGroupService:
             UserGroupMembershipDB.group_id == db_group.id
         ).count()
 
-        return UserGroup(
+        # Rows are already typed by the ORM, so skip re-validation on reads
+        return UserGroup.model_construct(
             id=db_group.id,
             name=db_group.name,
             description=db_group.description,
@@ -499,7 +506,9 @@ class UserGroupService:
         permissions = list(self.get_user_permissions(db, db_user.id))
         modules = list(self.get_user_modules(db, db_user.id))
 
-        return User(
+        # Rows are already typed by the ORM (and the email was validated on
+        # write), so skip re-validation on reads
+        return User.model_construct(
             id=db_user.id,
             username=db_user.username,
             email=db_user.email,
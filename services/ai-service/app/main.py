@@ -104,5 +104,7 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=port,
+        loop="uvloop",
+        http="httptools",
         log_level="info",
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, JSON, DateTime, Text, Enum as SQLEnum, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Boolean, Float, JSON, DateTime, Text, Enum as SQLEnum, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from shared.database import Base
@@ -12,11 +12,16 @@ class ComplianceTrendDB(Base):
     """Tracks compliance trends over time"""
     __tablename__ = "compliance_trends"
     __table_args__ = (
-        Index('ix_compliance_trends_snapshot_date', 'snapshot_date'),
+        # BRIN: append-only timestamp, physically correlated with insert order
+        Index('ix_compliance_trends_snapshot_date', 'snapshot_date',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        # Latest-snapshot and trend-window lookups per device (NULL = overall)
+        Index('ix_compliance_trends_device_date', 'device_id', text('snapshot_date DESC'),
+              postgresql_include=['overall_compliance', 'compliance_change']),
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    snapshot_date = Column(DateTime, default=datetime.utcnow)
+    snapshot_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     device_id = Column(Integer, nullable=True)  # Foreign key removed - cross-service reference
     
     # Compliance metrics
@@ -45,7 +50,8 @@ class ComplianceForecastDB(Base):
     """Predictive compliance forecasts"""
     __tablename__ = "compliance_forecasts"
     __table_args__ = (
-        Index('ix_compliance_forecasts_date', 'forecast_date'),
+        Index('ix_compliance_forecasts_date', 'forecast_date',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -68,17 +74,27 @@ class ComplianceAnomalyDB(Base):
     """Detected compliance anomalies"""
     __tablename__ = "compliance_anomalies"
     __table_args__ = (
-        Index('ix_compliance_anomalies_detected_at', 'detected_at'),
+        Index('ix_compliance_anomalies_detected_at', 'detected_at',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
         Index('ix_compliance_anomalies_device_acknowledged', 'device_id', 'acknowledged'),
+        # Open anomalies, newest first, for the dashboard and per-device lists
+        Index('ix_compliance_anomalies_unacked', 'device_id', text('detected_at DESC'),
+              postgresql_include=['severity', 'anomaly_type'],
+              postgresql_where=text('acknowledged = false'),
+              sqlite_where=text('acknowledged = 0')),
+        # Recent open anomalies across all devices (dashboard summary count)
+        Index('ix_compliance_anomalies_pending', text('detected_at DESC'),
+              postgresql_where=text('acknowledged = false'),
+              sqlite_where=text('acknowledged = 0')),
     )
 
     id = Column(Integer, primary_key=True, index=True)
     device_id = Column(Integer, nullable=True)  # Foreign key removed - cross-service reference
-    detected_at = Column(DateTime, default=datetime.utcnow)
+    detected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Anomaly details
     anomaly_type = Column(String(100), nullable=False)  # compliance_drop, unusual_pattern, spike_failures
-    severity = Column(SQLEnum(SeverityLevel), default=SeverityLevel.MEDIUM)
+    severity = Column(SQLEnum(SeverityLevel, native_enum=False, length=32), default=SeverityLevel.MEDIUM)
     description = Column(Text, nullable=True)
     
     # Statistical metrics
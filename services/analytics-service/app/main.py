@@ -76,5 +76,7 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=3006,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -3,15 +3,19 @@ API Gateway - Main Entry Point
 Handles service discovery and request routing
 """
 
+import asyncio
 import os
+import re
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
 import sys
 from shared.logger import setup_logger
 from shared.monitoring import router as monitoring_router
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
 logger = setup_logger(__name__)
 
@@ -35,65 +39,127 @@ app.add_middleware(
 # Include monitoring router for metrics endpoint
 app.include_router(monitoring_router, tags=["Monitoring"])
 
+# Shared HTTP client so upstream connections are pooled and kept alive
+# across requests instead of being rebuilt per call
+http_client = httpx.AsyncClient(
+    follow_redirects=False,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200)
+)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled upstream connections"""
+    await http_client.aclose()
+
+@dataclass(frozen=True, slots=True)
+class ServiceEntry:
+    """Registered backend service and the route prefixes it owns"""
+    id: str
+    url: str
+    name: str
+    enabled: bool
+    routes: Tuple[str, ...]
+    ui_routes: Tuple[str, ...]
+
+
 # Service registry (can be moved to database/Redis later)
-SERVICES = {
-    "device-service": {
-        "url": "http://device-service:3001",
-        "name": "Device Management",
-        "enabled": True,
-        "routes": ["/devices", "/device-groups", "/discovery-groups", "/device-import", "/health"],
-        "ui_routes": ["devices", "discovery", "health"]
-    },
-    "rule-service": {
-        "url": "http://rule-service:3002",
-        "name": "Rule & Audit Management",
-        "enabled": True,
-        "routes": ["/rules", "/rule-templates", "/audit", "/audit-schedules"],
-        "ui_routes": ["rules", "audits"]
-    },
-    "backup-service": {
-        "url": "http://backup-service:3003",
-        "name": "Configuration Backup",
-        "enabled": True,
-        "routes": ["/config-backups", "/drift-detection"],
-        "ui_routes": ["backups", "drift"]
-    },
-    "inventory-service": {
-        "url": "http://inventory-service:3004",
-        "name": "Hardware Inventory",
-        "enabled": True,
-        "routes": ["/hardware", "/hardware-inventory"],
-        "ui_routes": ["inventory"]
-    },
-    "admin-service": {
-        "url": "http://admin-service:3005",
-        "name": "Administration",
-        "enabled": True,
-        "routes": ["/admin", "/user-management", "/integrations", "/notifications", "/remediation", "/license", "/activity-feed"],
-        "ui_routes": ["admin", "users", "integrations", "license"]
-    },
-    "analytics-service": {
-        "url": "http://analytics-service:3006",
-        "name": "Analytics",
-        "enabled": True,
-        "routes": ["/analytics"],
-        "ui_routes": ["analytics"]
-    },
-    "workflow-service": {
-        "url": "http://admin-service:3005",  # Temporarily route to admin-service
-        "name": "Workflows",
-        "enabled": False,  # Disabled until implemented
-        "routes": ["/workflows"],
-        "ui_routes": ["workflows"]
-    },
-    "ai-service": {
-        "url": "http://ai-service:3007",
-        "name": "AI & MCP",
-        "enabled": True,
-        "routes": ["/ai", "/mcp"],
-        "ui_routes": ["ai", "mcp"]
-    },
-}
+SERVICES: Tuple[ServiceEntry, ...] = (
+    ServiceEntry(
+        id="device-service",
+        url="http://device-service:3001",
+        name="Device Management",
+        enabled=True,
+        routes=("/devices", "/device-groups", "/discovery-groups", "/device-import", "/health"),
+        ui_routes=("devices", "discovery", "health")
+    ),
+    ServiceEntry(
+        id="rule-service",
+        url="http://rule-service:3002",
+        name="Rule & Audit Management",
+        enabled=True,
+        routes=("/rules", "/rule-templates", "/audit", "/audit-schedules"),
+        ui_routes=("rules", "audits")
+    ),
+    ServiceEntry(
+        id="backup-service",
+        url="http://backup-service:3003",
+        name="Configuration Backup",
+        enabled=True,
+        routes=("/config-backups", "/drift-detection"),
+        ui_routes=("backups", "drift")
+    ),
+    ServiceEntry(
+        id="inventory-service",
+        url="http://inventory-service:3004",
+        name="Hardware Inventory",
+        enabled=True,
+        routes=("/hardware", "/hardware-inventory"),
+        ui_routes=("inventory",)
+    ),
+    ServiceEntry(
+        id="admin-service",
+        url="http://admin-service:3005",
+        name="Administration",
+        enabled=True,
+        routes=("/admin", "/user-management", "/integrations", "/notifications", "/remediation", "/license", "/activity-feed"),
+        ui_routes=("admin", "users", "integrations", "license")
+    ),
+    ServiceEntry(
+        id="analytics-service",
+        url="http://analytics-service:3006",
+        name="Analytics",
+        enabled=True,
+        routes=("/analytics",),
+        ui_routes=("analytics",)
+    ),
+    ServiceEntry(
+        id="workflow-service",
+        url="http://admin-service:3005",  # Temporarily route to admin-service
+        name="Workflows",
+        enabled=False,  # Disabled until implemented
+        routes=("/workflows",),
+        ui_routes=("workflows",)
+    ),
+    ServiceEntry(
+        id="ai-service",
+        url="http://ai-service:3007",
+        name="AI & MCP",
+        enabled=True,
+        routes=("/ai", "/mcp"),
+        ui_routes=("ai", "mcp")
+    ),
+)
+
+
+def _build_route_dispatch(services: Tuple[ServiceEntry, ...]):
+    """
+    Compile all service route prefixes into one anchored regex.
+
+    Alternatives keep registry order, so the first matching prefix wins
+    exactly as a scan over SERVICES would.
+    """
+    route_map = {}
+    for service in services:
+        for route_prefix in service.routes:
+            route_map.setdefault(route_prefix, service)
+    pattern = re.compile("|".join(re.escape(prefix) for prefix in route_map))
+    return pattern, route_map
+
+
+ROUTE_PATTERN, ROUTE_MAP = _build_route_dispatch(SERVICES)
+
+# Connection-level headers that must not be forwarded between hops
+HOP_BY_HOP_HEADERS = frozenset({
+    "host", "content-length", "transfer-encoding", "connection", "keep-alive",
+    "proxy-authenticate", "proxy-authorization", "te", "trailer", "upgrade"
+})
+
+
+def _forward_headers(headers) -> Dict[str, str]:
+    """Copy headers, dropping hop-by-hop ones"""
+    return {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
 
 @app.get("/")
 async def root():
@@ -109,14 +175,14 @@ async def root():
 async def get_services():
     """Return list of available services for frontend discovery"""
     services_list = []
-    for service_id, service_info in SERVICES.items():
-        if service_info["enabled"]:
+    for service in SERVICES:
+        if service.enabled:
             services_list.append({
-                "id": service_id,
-                "name": service_info["name"],
-                "enabled": service_info["enabled"],
-                "ui_routes": service_info["ui_routes"],
-                "api_routes": service_info["routes"]
+                "id": service.id,
+                "name": service.name,
+                "enabled": service.enabled,
+                "ui_routes": list(service.ui_routes),
+                "api_routes": list(service.routes)
             })
     return services_list
 
@@ -124,19 +190,18 @@ async def get_services():
 async def unified_login(request: Request):
     """Unified login endpoint for all users (admin, operator, viewer)"""
     try:
-        async with httpx.AsyncClient() as client:
-            # Forward login request to admin-service
-            response = await client.post(
-                "http://admin-service:3005/admin/login",
-                headers={"Content-Type": "application/json"},
-                content=await request.body(),
-                timeout=10.0
-            )
-
-            return JSONResponse(
-                content=response.json() if response.content else {},
-                status_code=response.status_code
-            )
+        # Forward login request to admin-service
+        response = await http_client.post(
+            "http://admin-service:3005/admin/login",
+            headers={"Content-Type": "application/json"},
+            content=await request.body(),
+            timeout=10.0
+        )
+
+        return JSONResponse(
+            content=response.json() if response.content else {},
+            status_code=response.status_code
+        )
     except Exception as e:
         logger.error(f"Error during login: {e}")
         raise HTTPException(status_code=502, detail=f"Login service unavailable: {str(e)}")
@@ -145,18 +210,17 @@ async def unified_login(request: Request):
 async def get_current_user(request: Request):
     """Get current authenticated user info"""
     try:
-        async with httpx.AsyncClient() as client:
-            # Forward request to admin-service with authorization header
-            response = await client.get(
-                "http://admin-service:3005/admin/me",
-                headers=dict(request.headers),
-                timeout=10.0
-            )
-
-            return JSONResponse(
-                content=response.json() if response.content else {},
-                status_code=response.status_code
-            )
+        # Forward request to admin-service with authorization header
+        response = await http_client.get(
+            "http://admin-service:3005/admin/me",
+            headers=dict(request.headers),
+            timeout=10.0
+        )
+
+        return JSONResponse(
+            content=response.json() if response.content else {},
+            status_code=response.status_code
+        )
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
         raise HTTPException(status_code=502, detail=f"User service unavailable: {str(e)}")
@@ -166,28 +230,32 @@ async def health_check():
     """Aggregate health check for all services"""
     health_status = {"gateway": "healthy", "services": {}}
 
-    async with httpx.AsyncClient() as client:
-        for service_id, service_info in SERVICES.items():
-            try:
-                response = await client.get(f"{service_info['url']}/health", timeout=2.0)
-                health_status["services"][service_id] = {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "response_time_ms": int(response.elapsed.total_seconds() * 1000)
-                }
-            except Exception as e:
-                health_status["services"][service_id] = {
-                    "status": "unreachable",
-                    "error": str(e)
-                }
+    # Probe all services concurrently so one slow service doesn't delay the rest
+    results = await asyncio.gather(
+        *(http_client.get(f"{service.url}/health", timeout=2.0) for service in SERVICES),
+        return_exceptions=True
+    )
+
+    for service, result in zip(SERVICES, results):
+        service_id = service.id
+        if isinstance(result, Exception):
+            health_status["services"][service_id] = {
+                "status": "unreachable",
+                "error": str(result)
+            }
+        else:
+            health_status["services"][service_id] = {
+                "status": "healthy" if result.status_code == 200 else "unhealthy",
+                "response_time_ms": int(result.elapsed.total_seconds() * 1000)
+            }
 
     return health_status
 
-@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
-async def proxy_request(request: Request, path: str):
+async def proxy_request(request: Request):
     """Proxy requests to appropriate microservice"""
 
     # Normalize path - remove trailing slash if present
-    original_path = path
+    original_path = path = request.path_params["path"]
     path = path.rstrip('/')
     
     # Remove /api prefix if present (for backward compatibility)
@@ -195,14 +263,8 @@ async def proxy_request(request: Request, path: str):
         path = path[4:]  # Remove 'api/'
 
     # Determine which service should handle this request
-    target_service = None
-    for service_id, service_info in SERVICES.items():
-        for route_prefix in service_info["routes"]:
-            if f"/{path}".startswith(route_prefix):
-                target_service = service_info
-                break
-        if target_service:
-            break
+    match = ROUTE_PATTERN.match(f"/{path}")
+    target_service = ROUTE_MAP[match.group(0)] if match else None
 
     if not target_service:
         raise HTTPException(status_code=404, detail=f"No service found for path: /{path}")
@@ -216,13 +278,13 @@ async def proxy_request(request: Request, path: str):
     # - /device-groups → /device-groups/ (collection)
     
     # Check if path exactly matches a route prefix (collection endpoint)
-    is_collection_endpoint = f"/{path}" in target_service["routes"]
+    is_collection_endpoint = f"/{path}" in target_service.routes
     
     # Add trailing slash for collection endpoints or if original had it
     if original_path.endswith('/') or is_collection_endpoint:
-        url = f"{target_service['url']}/{path}/"
+        url = f"{target_service.url}/{path}/"
     else:
-        url = f"{target_service['url']}/{path}"
+        url = f"{target_service.url}/{path}"
 
     # Preserve query string
     if request.url.query:
@@ -237,43 +299,45 @@ async def proxy_request(request: Request, path: str):
         elif '/ai/' in f'/{path}' or path.startswith('ai/'):
             request_timeout = 300.0  # 5 minutes for AI/LLM calls (local models are slow on CPU)
         
-        async with httpx.AsyncClient(follow_redirects=False) as client:
-            # Forward request with same method, headers, and body
-            response = await client.request(
-                method=request.method,
-                url=url,
-                headers=dict(request.headers),
-                content=await request.body(),
-                timeout=request_timeout
-            )
-
-            # Return the response with proper content type
-            # Handle 204 No Content specially - must not have a body
-            if response.status_code == 204:
-                return Response(status_code=204)
-
-            if response.content:
-                try:
-                    # Try to parse as JSON
-                    content = response.json()
-                    return JSONResponse(
-                        content=content,
-                        status_code=response.status_code
-                    )
-                except:
-                    # If not JSON, return raw response
-                    return Response(
-                        content=response.content,
-                        status_code=response.status_code,
-                        headers=dict(response.headers),
-                        media_type=response.headers.get('content-type', 'application/octet-stream')
-                    )
-            else:
-                return Response(status_code=response.status_code)
+        # Stream the request body only when the client sent one
+        has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+
+        # Forward request with same method, headers, and body, streaming both
+        # directions instead of buffering whole payloads in the gateway
+        upstream_request = http_client.build_request(
+            method=request.method,
+            url=url,
+            headers=_forward_headers(request.headers),
+            content=request.stream() if has_body else None,
+            timeout=request_timeout
+        )
+        response = await http_client.send(upstream_request, stream=True)
+
+        # Handle 204 No Content specially - must not have a body
+        if response.status_code == 204:
+            await response.aclose()
+            return Response(status_code=204)
+
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=_forward_headers(response.headers),
+            background=BackgroundTask(response.aclose)
+        )
     except Exception as e:
         logger.error(f"Error forwarding request to {url}: {e}")
         raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
 
+# Registered as a plain Starlette route (last, so explicit routes win): the
+# proxy takes the raw Request, so FastAPI's dependency solving and response
+# model handling would only add per-request overhead
+app.add_route(
+    "/{path:path}",
+    proxy_request,
+    methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+    include_in_schema=False
+)
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -283,5 +347,7 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=3000,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -17,7 +17,7 @@ from services.discovery_service import DiscoveryService
 from services.health_service import HealthService
 from shared.crypto import decrypt_password
 from models.device import Device
-from models.enums import VendorType
+from models.discovery_group import DiscoveryGroup
 
 logger = setup_logger(__name__)
 
@@ -32,95 +32,106 @@ async def run_scheduled_discoveries():
     """Check for and run scheduled discoveries"""
     db = SessionLocal()
     try:
-        groups = discovery_group_service.get_scheduled_groups(db)
-        if not groups:
-            logger.debug("No scheduled discovery groups due to run")
-            return
-            
-        logger.info(f"Found {len(groups)} discovery groups due to run")
+        scheduled = discovery_group_service.get_scheduled_groups_with_passwords(db)
+    except Exception as e:
+        logger.error(f"Error in run_scheduled_discoveries: {str(e)}")
+        return
+    finally:
+        db.close()
 
-        for group in groups:
-            try:
-                # Get decrypted password
-                password = discovery_group_service.get_decrypted_password(db, group.id)
+    if not scheduled:
+        logger.debug("No scheduled discovery groups due to run")
+        return
 
-                # Run discovery
-                logger.info(f"Running scheduled discovery for group: {group.name}")
-                discovered = await discovery_service.discover_subnet(
-                    subnet=group.subnet,
-                    username=group.username,
-                    password=password,
-                    port=group.port,
-                    excluded_ips=group.excluded_ips
-                )
+    logger.info(f"Found {len(scheduled)} discovery groups due to run")
 
-                # Merge discovered devices
-                added_count, device_ids = device_service.merge_discovered_devices(db, discovered)
+    # Scan due groups concurrently, bounded so overlapping subnet sweeps
+    # don't flood the network
+    semaphore = asyncio.Semaphore(settings.discovery_concurrency)
+    await asyncio.gather(*(
+        _run_discovery_group(group, password, semaphore) for group, password in scheduled
+    ))
 
-                # Collect metadata for discovered/updated devices
-                if device_ids:
-                    logger.info(f"Scheduled discovery '{group.name}': Collecting metadata for {len(device_ids)} devices")
-                    await device_service.collect_metadata_for_discovered_devices(db, device_ids)
 
-                # Update timestamps
-                discovery_group_service.update_run_timestamps(db, group.id)
+async def _run_discovery_group(group: DiscoveryGroup, password: str, semaphore: asyncio.Semaphore):
+    """Discover and merge one group on its own session (sessions can't be shared across tasks)"""
+    async with semaphore:
+        db = SessionLocal()
+        try:
+            # Run discovery
+            logger.info(f"Running scheduled discovery for group: {group.name}")
+            discovered = await discovery_service.discover_subnet(
+                subnet=group.subnet,
+                username=group.username,
+                password=password,
+                port=group.port,
+                excluded_ips=group.excluded_ips
+            )
 
-                logger.info(f"Scheduled discovery '{group.name}': found {len(discovered)}, added {added_count}")
+            # Merge discovered devices
+            added_count, device_ids = device_service.merge_discovered_devices(db, discovered)
 
-            except Exception as e:
-                logger.error(f"Error running scheduled discovery for group {group.id}: {str(e)}")
+            # Collect metadata for discovered/updated devices
+            if device_ids:
+                logger.info(f"Scheduled discovery '{group.name}': Collecting metadata for {len(device_ids)} devices")
+                await device_service.collect_metadata_for_discovered_devices(db, device_ids)
 
-    except Exception as e:
-        logger.error(f"Error in run_scheduled_discoveries: {str(e)}")
-    finally:
-        db.close()
+            # Update timestamps
+            discovery_group_service.update_run_timestamps(db, group.id)
+
+            logger.info(f"Scheduled discovery '{group.name}': found {len(discovered)}, added {added_count}")
+
+        except Exception as e:
+            logger.error(f"Error running scheduled discovery for group {group.id}: {str(e)}")
+        finally:
+            db.close()
 
 
 async def run_health_checks():
     """Run health checks on all devices"""
     db = SessionLocal()
     try:
-        # Get all devices
-        devices_db = device_service.get_all_devices(db)
-        
-        if not devices_db:
+        results = []
+
+        # Work through the fleet a chunk at a time instead of loading every device
+        for devices_db in device_service.iter_all_devices(db):
+            # Convert to Device models - decrypt passwords for health checks
+            devices = []
+            for device_db in devices_db:
+                try:
+                    # Decrypt password before passing to health service
+                    decrypted_pwd = decrypt_password(device_db.password) if device_db.password else None
+                    # Fields were already validated by DeviceService, so skip revalidating
+                    device = Device.model_construct(
+                        id=device_db.id,
+                        hostname=device_db.hostname,
+                        vendor=device_db.vendor,
+                        ip=device_db.ip,
+                        port=device_db.port,
+                        username=device_db.username,
+                        password=decrypted_pwd,
+                        status=device_db.status
+                    )
+                    devices.append(device)
+                except Exception as e:
+                    logger.error(f"Error converting device {device_db.hostname}: {str(e)}")
+
+            # Run health checks with concurrency control (handled by health_service)
+            if devices:
+                results.extend(await health_service.check_all_devices_health(db, devices))
+
+        if not results:
             logger.debug("No devices found for health checks")
             return
-            
-        logger.info(f"Starting periodic health checks for {len(devices_db)} devices")
-
-        # Convert to Device models - decrypt passwords for health checks
-        devices = []
-        for device_db in devices_db:
-            try:
-                # Decrypt password before passing to health service
-                decrypted_pwd = decrypt_password(device_db.password) if device_db.password else None
-                device = Device(
-                    id=device_db.id,
-                    hostname=device_db.hostname,
-                    vendor=device_db.vendor,
-                    ip=device_db.ip,
-                    port=device_db.port,
-                    username=device_db.username,
-                    password=decrypted_pwd,
-                    status=device_db.status
-                )
-                devices.append(device)
-            except Exception as e:
-                logger.error(f"Error converting device {device_db.hostname}: {str(e)}")
-
-        # Run health checks with concurrency control (handled by health_service)
-        if devices:
-            results = await health_service.check_all_devices_health(db, devices)
-            
-            # Count statuses
-            healthy = sum(1 for r in results if r.get('overall_status') == 'healthy')
-            degraded = sum(1 for r in results if r.get('overall_status') == 'degraded')
-            unreachable = sum(1 for r in results if r.get('overall_status') == 'unreachable')
-            skipped = sum(1 for r in results if r.get('skipped', False))
-            
-            logger.info(f"Health checks completed: {len(results)} devices checked "
-                       f"(healthy: {healthy}, degraded: {degraded}, unreachable: {unreachable}, skipped: {skipped})")
+
+        # Count statuses
+        healthy = sum(1 for r in results if r.get('overall_status') == 'healthy')
+        degraded = sum(1 for r in results if r.get('overall_status') == 'degraded')
+        unreachable = sum(1 for r in results if r.get('overall_status') == 'unreachable')
+        skipped = sum(1 for r in results if r.get('skipped', False))
+
+        logger.info(f"Health checks completed: {len(results)} devices checked "
+                   f"(healthy: {healthy}, degraded: {degraded}, unreachable: {unreachable}, skipped: {skipped})")
 
     except Exception as e:
         logger.error(f"Error in run_health_checks: {str(e)}")
@@ -3,9 +3,10 @@
 # services/device_service.py
 # ============================================================================
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import or_
 from models.device import Device, DeviceCreate, DeviceUpdate
 from models.enums import DeviceStatus, VendorType
 from db_models import DeviceDB
@@ -30,6 +31,24 @@ class DeviceService:
         db_devices = db.query(DeviceDB).all()
         return [self._to_pydantic(d) for d in db_devices]
 
+    def iter_all_devices(self, db: Session, chunk_size: int = 256) -> Iterator[List[Device]]:
+        """
+        Yield all devices in chunks of chunk_size
+
+        Pages by id rather than holding a streaming cursor open, so callers can
+        await and commit between chunks.
+        """
+        last_id = 0
+        while True:
+            db_devices = db.query(DeviceDB).filter(
+                DeviceDB.id > last_id
+            ).order_by(DeviceDB.id).limit(chunk_size).all()
+            if db_devices:
+                yield [self._to_pydantic(d) for d in db_devices]
+            if len(db_devices) < chunk_size:
+                return
+            last_id = db_devices[-1].id
+
     def get_device_by_id(self, db: Session, device_id: int) -> Optional[Device]:
         """Get device by ID"""
         db_device = db.query(DeviceDB).filter(DeviceDB.id == device_id).first()
@@ -148,6 +167,16 @@ class DeviceService:
         logger.info(f"Deleted device ID: {device_id}")
         return True
 
+    @staticmethod
+    def _index_existing_devices(db: Session, discovered: List[Device]):
+        """Load every existing device matching a discovered IP or hostname in one query"""
+        ips = {d.ip for d in discovered if d.ip}
+        hostnames = {d.hostname for d in discovered}
+        existing = db.query(DeviceDB).filter(
+            or_(DeviceDB.ip.in_(ips), DeviceDB.hostname.in_(hostnames))
+        ).all()
+        return {d.ip: d for d in existing if d.ip}, {d.hostname: d for d in existing}
+
     def merge_discovered_devices(self, db: Session, discovered: List[Device]) -> tuple[int, List[int]]:
         """
         Merge discovered devices with existing ones
@@ -162,27 +191,23 @@ class DeviceService:
         # This prevents incorrectly deleting devices when they swap identifiers
         swap_candidates = []
 
+        # One lookup for every candidate match instead of several queries per device
+        by_ip, by_hostname = self._index_existing_devices(db, discovered)
+        discovered_pairs = {(d.ip, d.hostname) for d in discovered}
+
         for new_device in discovered:
             if not new_device.ip:
                 continue
 
-            existing_by_ip = db.query(DeviceDB).filter(DeviceDB.ip == new_device.ip).first()
+            existing_by_ip = by_ip.get(new_device.ip)
 
             if existing_by_ip and existing_by_ip.hostname != new_device.hostname:
                 # This device's hostname changed - check if it's part of a swap
-                conflict_device = db.query(DeviceDB).filter(
-                    DeviceDB.hostname == new_device.hostname,
-                    DeviceDB.id != existing_by_ip.id
-                ).first()
+                conflict_device = by_hostname.get(new_device.hostname)
 
-                if conflict_device:
+                if conflict_device and conflict_device is not existing_by_ip:
                     # Check if this is a swap: does the conflict device want our old hostname?
-                    reverse_discovery = next(
-                        (d for d in discovered if d.ip == conflict_device.ip and d.hostname == existing_by_ip.hostname),
-                        None
-                    )
-
-                    if reverse_discovery:
+                    if (conflict_device.ip, existing_by_ip.hostname) in discovered_pairs:
                         # This is a hostname SWAP between two devices
                         logger.info(f"Detected hostname swap: {existing_by_ip.hostname} <-> {conflict_device.hostname} between IPs {existing_by_ip.ip} and {conflict_device.ip}")
                         swap_candidates.append((existing_by_ip, conflict_device, new_device.hostname, existing_by_ip.hostname))
@@ -204,6 +229,8 @@ class DeviceService:
             device_a.hostname = hostname_a_wants
             device_b.hostname = hostname_b_wants
             db.flush()
+            by_hostname[hostname_a_wants] = device_a
+            by_hostname[hostname_b_wants] = device_b
 
             # Track that these were already handled
             temp_hostname_map[device_a.ip] = device_a.id
@@ -214,7 +241,7 @@ class DeviceService:
             # Skip devices already handled in swap phase
             if new_device.ip in temp_hostname_map:
                 device_id = temp_hostname_map[new_device.ip]
-                existing = db.query(DeviceDB).filter(DeviceDB.id == device_id).first()
+                existing = db.get(DeviceDB, device_id)
                 if existing:
                     # Update other fields that might have changed
                     existing.vendor = new_device.vendor
@@ -229,22 +256,17 @@ class DeviceService:
                 continue
 
             # First check if a device with this IP already exists (primary match)
-            existing_by_ip = None
-            if new_device.ip:
-                existing_by_ip = db.query(DeviceDB).filter(DeviceDB.ip == new_device.ip).first()
+            existing_by_ip = by_ip.get(new_device.ip) if new_device.ip else None
 
             # Also check by hostname
-            existing_by_hostname = db.query(DeviceDB).filter(DeviceDB.hostname == new_device.hostname).first()
+            existing_by_hostname = by_hostname.get(new_device.hostname)
 
             if existing_by_ip:
                 # Device with this IP exists - update it
                 if existing_by_ip.hostname != new_device.hostname:
                     # Hostname changed - need to handle UNIQUE constraint
                     # Check if another device already has the new hostname
-                    conflict_device = db.query(DeviceDB).filter(
-                        DeviceDB.hostname == new_device.hostname,
-                        DeviceDB.id != existing_by_ip.id
-                    ).first()
+                    conflict_device = existing_by_hostname if existing_by_hostname is not existing_by_ip else None
 
                     if conflict_device:
                         # Device conflict that wasn't a swap - this means the conflicting device is no longer discovered
@@ -254,9 +276,13 @@ class DeviceService:
                         logger.info(f"Removing device '{conflict_device.hostname}' at {conflict_device.ip} (ID: {conflict_device.id}) - not discovered and hostname claimed by {new_device.ip}")
                         db.delete(conflict_device)
                         db.flush()  # Flush to release the hostname constraint
+                        if by_ip.get(conflict_device.ip) is conflict_device:
+                            del by_ip[conflict_device.ip]
 
                     logger.info(f"Hostname changed for device at {new_device.ip}: {existing_by_ip.hostname} -> {new_device.hostname}")
+                    by_hostname.pop(existing_by_ip.hostname, None)
                     existing_by_ip.hostname = new_device.hostname
+                    by_hostname[new_device.hostname] = existing_by_ip
 
                 # Update other fields that might have changed
                 existing_by_ip.vendor = new_device.vendor
@@ -272,19 +298,22 @@ class DeviceService:
             elif existing_by_hostname:
                 # Device with this hostname exists but different IP - update IP
                 # Check if there's already a device at the new IP
-                ip_conflict = db.query(DeviceDB).filter(
-                    DeviceDB.ip == new_device.ip,
-                    DeviceDB.id != existing_by_hostname.id
-                ).first()
+                ip_conflict = by_ip.get(new_device.ip)
+                if ip_conflict is existing_by_hostname:
+                    ip_conflict = None
 
                 if ip_conflict:
                     logger.warning(f"IP conflict: device '{new_device.hostname}' wants IP {new_device.ip}, but device {ip_conflict.id} ('{ip_conflict.hostname}') already has it")
                     logger.warning(f"Conflicting device {ip_conflict.id} was not discovered - removing it")
                     db.delete(ip_conflict)
                     db.flush()
+                    by_hostname.pop(ip_conflict.hostname, None)
 
                 logger.info(f"IP changed for device {new_device.hostname}: {existing_by_hostname.ip} -> {new_device.ip}")
+                if by_ip.get(existing_by_hostname.ip) is existing_by_hostname:
+                    del by_ip[existing_by_hostname.ip]
                 existing_by_hostname.ip = new_device.ip
+                by_ip[new_device.ip] = existing_by_hostname
                 existing_by_hostname.vendor = new_device.vendor
                 existing_by_hostname.port = new_device.port or 830
                 existing_by_hostname.username = new_device.username
@@ -310,6 +339,9 @@ class DeviceService:
                 )
                 db.add(db_device)
                 db.flush()  # Flush to get the ID
+                by_hostname[db_device.hostname] = db_device
+                if db_device.ip:
+                    by_ip[db_device.ip] = db_device
                 device_ids_for_metadata.add(db_device.id)
                 added_count += 1
                 logger.info(f"Added new device: {new_device.hostname} at {new_device.ip}")
@@ -3,9 +3,10 @@
 # services/device_service.py
 # ============================================================================
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import or_
 from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm.base import instance_state
 from models.device import Device, DeviceCreate, DeviceUpdate
@@ -31,11 +32,35 @@ class DeviceService:
         db_devices = db.query(DeviceDB).all()
         return [self._to_pydantic(d) for d in db_devices]
 
+    def iter_all_devices(self, db: Session, chunk_size: int = 256) -> Iterator[List[Device]]:
+        """
+        Yield all devices in chunks of chunk_size
+
+        Pages by id rather than holding a streaming cursor open, so callers can
+        await and commit between chunks.
+        """
+        last_id = 0
+        while True:
+            db_devices = db.query(DeviceDB).filter(
+                DeviceDB.id > last_id
+            ).order_by(DeviceDB.id).limit(chunk_size).all()
+            if db_devices:
+                yield [self._to_pydantic(d) for d in db_devices]
+            if len(db_devices) < chunk_size:
+                return
+            last_id = db_devices[-1].id
+
     def get_device_by_id(self, db: Session, device_id: int) -> Optional[Device]:
         """Get device by ID"""
         db_device = db.query(DeviceDB).filter(DeviceDB.id == device_id).first()
         return self._to_pydantic(db_device) if db_device else None
 
+    def get_devices_by_ids(self, db: Session, device_ids: List[int]) -> List[Device]:
+        """Get devices by ID in one query, in the order given; missing IDs are skipped"""
+        ids = list(dict.fromkeys(device_ids))
+        db_devices = {d.id: d for d in db.query(DeviceDB).filter(DeviceDB.id.in_(ids))}
+        return [self._to_pydantic(db_devices[i]) for i in ids if i in db_devices]
+
     def get_device_by_hostname(self, db: Session, hostname: str) -> Optional[Device]:
         """Get device by hostname"""
         db_device = db.query(DeviceDB).filter(DeviceDB.hostname == hostname).first()
@@ -113,6 +138,16 @@ class DeviceService:
         logger.info(f"Deleted device ID: {device_id}")
         return True
 
+    @staticmethod
+    def _index_existing_devices(db: Session, discovered: List[Device]):
+        """Load every existing device matching a discovered IP or hostname in one query"""
+        ips = {d.ip for d in discovered if d.ip}
+        hostnames = {d.hostname for d in discovered}
+        existing = db.query(DeviceDB).filter(
+            or_(DeviceDB.ip.in_(ips), DeviceDB.hostname.in_(hostnames))
+        ).all()
+        return {d.ip: d for d in existing if d.ip}, {d.hostname: d for d in existing}
+
     def merge_discovered_devices(self, db: Session, discovered: List[Device]) -> int:
         """
         Merge discovered devices with existing ones
@@ -122,32 +157,34 @@ class DeviceService:
         # First pass: separate new devices from updates
         new_devices_to_add = []
         
+        # One lookup for every candidate match instead of two or three queries per device
+        by_ip, by_hostname = self._index_existing_devices(db, discovered)
+
         for new_device in discovered:
             # First check if a device with this IP already exists (primary match)
-            existing_by_ip = None
-            if new_device.ip:
-                existing_by_ip = db.query(DeviceDB).filter(DeviceDB.ip == new_device.ip).first()
+            existing_by_ip = by_ip.get(new_device.ip) if new_device.ip else None
 
             # Also check by hostname
-            existing_by_hostname = db.query(DeviceDB).filter(DeviceDB.hostname == new_device.hostname).first()
+            existing_by_hostname = by_hostname.get(new_device.hostname)
 
             if existing_by_ip:
                 # Device with this IP exists - update it (doesn't count against quota)
                 if existing_by_ip.hostname != new_device.hostname:
                     # Hostname changed - need to handle UNIQUE constraint
                     # Check if another device already has the new hostname
-                    conflict_device = db.query(DeviceDB).filter(
-                        DeviceDB.hostname == new_device.hostname,
-                        DeviceDB.id != existing_by_ip.id
-                    ).first()
+                    conflict_device = existing_by_hostname if existing_by_hostname is not existing_by_ip else None
 
                     if conflict_device:
                         logger.info(f"Removing stale device '{conflict_device.hostname}' at {conflict_device.ip} (ID: {conflict_device.id}) - hostname now belongs to {new_device.ip}")
                         db.delete(conflict_device)
                         db.flush()  # Flush to release the hostname constraint
+                        if by_ip.get(conflict_device.ip) is conflict_device:
+                            del by_ip[conflict_device.ip]
 
                     logger.info(f"Hostname changed for device at {new_device.ip}: {existing_by_ip.hostname} -> {new_device.hostname}")
+                    by_hostname.pop(existing_by_ip.hostname, None)
                     existing_by_ip.hostname = new_device.hostname
+                    by_hostname[new_device.hostname] = existing_by_ip
 
                 # Update other fields that might have changed
                 existing_by_ip.vendor = new_device.vendor
@@ -160,7 +197,10 @@ class DeviceService:
             elif existing_by_hostname:
                 # Device with this hostname exists but different IP - update IP (doesn't count against quota)
                 logger.info(f"IP changed for device {new_device.hostname}: {existing_by_hostname.ip} -> {new_device.ip}")
+                if by_ip.get(existing_by_hostname.ip) is existing_by_hostname:
+                    del by_ip[existing_by_hostname.ip]
                 existing_by_hostname.ip = new_device.ip
+                by_ip[new_device.ip] = existing_by_hostname
                 existing_by_hostname.vendor = new_device.vendor
                 existing_by_hostname.port = new_device.port or 830
                 existing_by_hostname.username = new_device.username
@@ -2,7 +2,7 @@
 # services/discovery_group_service.py
 # ============================================================================
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from models.discovery_group import DiscoveryGroup, DiscoveryGroupCreate, DiscoveryGroupUpdate
@@ -97,13 +97,20 @@ class DiscoveryGroupService:
 
     def get_scheduled_groups(self, db: Session) -> List[DiscoveryGroup]:
         """Get groups that are due for discovery"""
+        return [self._to_pydantic(g) for g in self._due_groups(db)]
+
+    def get_scheduled_groups_with_passwords(self, db: Session) -> List[Tuple[DiscoveryGroup, str]]:
+        """Get groups due for discovery with their decrypted passwords (internal use only)"""
+        return [(self._to_pydantic(g), decrypt_password(g.password)) for g in self._due_groups(db)]
+
+    def _due_groups(self, db: Session) -> List[DiscoveryGroupDB]:
+        """Query scheduled, active groups whose next run has passed"""
         now = datetime.utcnow()
-        db_groups = db.query(DiscoveryGroupDB).filter(
+        return db.query(DiscoveryGroupDB).filter(
             DiscoveryGroupDB.schedule_enabled == True,
             DiscoveryGroupDB.active == True,
             DiscoveryGroupDB.next_run <= now
         ).all()
-        return [self._to_pydantic(g) for g in db_groups]
 
     def update_run_timestamps(self, db: Session, group_id: int):
         """Update last_run and next_run timestamps after discovery"""
@@ -116,9 +123,6 @@ class DiscoveryGroupService:
 
     def _to_pydantic(self, db_group: DiscoveryGroupDB) -> DiscoveryGroup:
         """Convert SQLAlchemy model to Pydantic model"""
-        # Decrypt password for API response (in production, you might want to mask this)
-        decrypted_password = decrypt_password(db_group.password)
-
         return DiscoveryGroup(
             id=db_group.id,
             name=db_group.name,
@@ -126,7 +130,7 @@ class DiscoveryGroupService:
             subnet=db_group.subnet,
             excluded_ips=db_group.excluded_ips or [],
             username=db_group.username,
-            password="****" if decrypted_password else "",  # Mask password in API responses
+            password="****" if db_group.password else "",  # Mask password in API responses
             port=db_group.port,
             schedule_enabled=db_group.schedule_enabled,
             schedule_interval=db_group.schedule_interval,
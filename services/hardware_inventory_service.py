@@ -4,6 +4,7 @@ Collects hardware inventory from Nokia SROS and Cisco IOS-XR devices
 """
 import asyncio
 from typing import List, Dict, Any, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from datetime import datetime
 import xml.etree.ElementTree as ET
@@ -44,13 +45,12 @@ class HardwareInventoryService:
             else:
                 return {"success": False, "error": f"Vendor {device.vendor} not supported"}
 
-            # Store in database
-            for comp in components:
-                hardware = HardwareInventoryDB(
-                    device_id=device_id,
-                    **comp
+            # Store in database with one batched multi-row INSERT
+            if components:
+                db.execute(
+                    insert(HardwareInventoryDB),
+                    [{"device_id": device_id, **comp} for comp in components]
                 )
-                db.add(hardware)
 
             db.commit()
 
@@ -314,29 +314,17 @@ class WorkflowEngine:
         context: WorkflowContext,
         execution: WorkflowExecutionDB
     ):
-        """Execute steps in DAG order with parallel execution where possible"""
-        # Build dependency graph
-        pending_steps = {step.name: step for step in workflow.steps}
-        ready_steps = []
+        """Execute steps in DAG order, running each wave of independent steps in parallel"""
+        steps_by_name = {step.name: step for step in workflow.steps}
 
-        # Find steps with no dependencies
-        for step in workflow.steps:
-            if not step.depends_on:
-                ready_steps.append(step)
-
-        while ready_steps or pending_steps:
-            if not ready_steps:
-                # Deadlock - circular dependency or missing dependency
-                raise ValueError("Workflow has unresolved dependencies or circular references")
-
-            # Execute all ready steps in parallel
+        for wave in workflow.execution_waves:
             tasks = []
-            for step in ready_steps:
+            for step_name in wave:
+                step = steps_by_name[step_name]
                 # Check condition
                 if step.condition and not context.evaluate_condition(step.condition):
                     logger.info(f"Skipping step '{step.name}' - condition not met")
                     self._log_step(execution, step, "skipped", None, None, "Condition not met")
-                    context.executed_steps.add(step.name)
                     continue
 
                 tasks.append(self._execute_step(step, context, execution))
@@ -345,17 +333,7 @@ class WorkflowEngine:
             if tasks:
                 await asyncio.gather(*tasks)
 
-            # Mark ready steps as executed
-            for step in ready_steps:
-                context.executed_steps.add(step.name)
-                if step.name in pending_steps:
-                    del pending_steps[step.name]
-
-            # Find next ready steps
-            ready_steps = []
-            for step_name, step in list(pending_steps.items()):
-                if all(dep in context.executed_steps for dep in step.depends_on):
-                    ready_steps.append(step)
+            context.executed_steps.update(wave)
 
     async def _execute_hybrid(
         self,
@@ -3,14 +3,55 @@
 # YAML Workflow Parser and Validator
 # ============================================================================
 
+import copy
+import hashlib
+import json
 import yaml
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional
+from dataclasses import dataclass, field, replace
+
+
+# Use the libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+VALID_API_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
+
+
+def _read_only(value: Any) -> Any:
+    """
+    Wrap a copy of a dict in a read-only view so parsed (and cached) steps
+    can't be mutated
+
+    The copy is deep so nested values aren't shared with the caller's
+    step_data, which would otherwise leak into later cache hits.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType(copy.deepcopy(value))
+    return value
+
+
+def _has_non_str_keys(value: Any) -> bool:
+    """Check whether any mapping nested in value has a non-string key"""
+    if isinstance(value, dict):
+        return any(not isinstance(k, str) or _has_non_str_keys(v) for k, v in value.items())
+    if isinstance(value, list):
+        return any(_has_non_str_keys(v) for v in value)
+    return False
 
 
 @dataclass
 class WorkflowStep:
-    """Represents a single workflow step"""
+    """
+    Represents a single workflow step
+
+    Mapping fields built by WorkflowParser are read-only views; copy them
+    before mutating.
+    """
     name: str
     type: str  # query, template, audit, remediate, transform, notification, api_call
     description: Optional[str] = None
@@ -20,24 +61,46 @@ class WorkflowStep:
     depends_on: List[str] = field(default_factory=list)
     condition: Optional[str] = None
     on_error: str = "fail"  # fail, continue, retry
-    vendor_specific: Optional[Dict[str, Any]] = None
+    vendor_specific: Optional[Mapping[str, Any]] = None
     template: Optional[str] = None
-    template_vars: Optional[Dict[str, Any]] = None
+    template_vars: Optional[Mapping[str, Any]] = None
     script: Optional[str] = None
     config_source: Optional[str] = None
-    compare: Optional[Dict[str, str]] = None
+    compare: Optional[Mapping[str, str]] = None
     validation: Optional[List[Dict[str, Any]]] = None
-    # API call specific fields
+    # API call specific fields. api_headers/api_body/api_params must be
+    # JSON-serializable (no tuples, datetimes, etc.); they are sent as JSON.
     api_url: Optional[str] = None
     api_method: Optional[str] = None  # GET, POST, PUT, DELETE, PATCH
-    api_headers: Optional[Dict[str, str]] = None
-    api_body: Optional[Dict[str, Any]] = None
-    api_params: Optional[Dict[str, Any]] = None
-    api_auth: Optional[Dict[str, Any]] = None  # {type: "bearer", token: "..."} or {type: "basic", user: "...", pass: "..."}
+    api_headers: Optional[Mapping[str, str]] = None
+    api_body: Optional[Mapping[str, Any]] = None
+    api_params: Optional[Mapping[str, Any]] = None
+    api_auth: Optional[Mapping[str, Any]] = None  # {type: "bearer", token: "..."} or {type: "basic", user: "...", pass: "..."}
     max_retries: int = 0
     retry_delay: int = 5
     timeout: Optional[int] = None
 
+    # Required-field checks per step type: (predicate, error message)
+    _REQUIRED_BY_TYPE = {
+        'query': [(lambda s: s.command or s.vendor_specific, "Query step '{name}' must have 'command' or 'vendor_specific'")],
+        'template': [(lambda s: s.template, "Template step '{name}' must have 'template' field")],
+        'audit': [(lambda s: s.compare, "Audit step '{name}' must have 'compare' field")],
+        'remediate': [(lambda s: s.config_source, "Remediate step '{name}' must have 'config_source' field")],
+        'transform': [(lambda s: s.script, "Transform step '{name}' must have 'script' field")],
+        'api_call': [
+            (lambda s: s.api_url, "API call step '{name}' must have 'api_url' field"),
+            (lambda s: s.api_method, "API call step '{name}' must have 'api_method' field"),
+            (lambda s: s.api_method in VALID_API_METHODS,
+             "API call step '{name}' has invalid method '{api_method}'. Must be one of: " + str(VALID_API_METHODS)),
+        ],
+    }
+
+    def __post_init__(self):
+        """Validate step has required fields for its type"""
+        for check, message in self._REQUIRED_BY_TYPE.get(self.type, ()):
+            if not check(self):
+                raise ValueError(message.format(name=self.name, api_method=self.api_method))
+
 
 @dataclass
 class WorkflowDefinition:
@@ -49,6 +112,9 @@ class WorkflowDefinition:
     steps: List[WorkflowStep] = field(default_factory=list)
     settings: Dict[str, Any] = field(default_factory=dict)
     completion_criteria: Dict[str, Any] = field(default_factory=dict)
+    # Step names grouped into dependency levels; steps within a wave are
+    # independent and can run concurrently (dag/hybrid modes only)
+    execution_waves: List[List[str]] = field(default_factory=list)
 
 
 class WorkflowParser:
@@ -57,6 +123,12 @@ class WorkflowParser:
     VALID_STEP_TYPES = ['query', 'template', 'audit', 'remediate', 'transform', 'notification', 'api_call']
     VALID_EXECUTION_MODES = ['sequential', 'dag', 'hybrid']
     VALID_ERROR_ACTIONS = ['fail', 'continue', 'retry']
+    STEP_CACHE_SIZE = 512
+
+    def __init__(self):
+        # Parsed steps keyed by a digest of their canonical JSON form, so
+        # boilerplate steps shared across workflows are only built once
+        self._step_cache: "OrderedDict[bytes, WorkflowStep]" = OrderedDict()
 
     def parse(self, yaml_content: str) -> WorkflowDefinition:
         """
@@ -111,7 +183,44 @@ class WorkflowParser:
         return workflow
 
     def _parse_step(self, step_data: Dict[str, Any], index: int) -> WorkflowStep:
-        """Parse a single step"""
+        """Parse a single step, reusing a cached parse of an identical step dict"""
+        cache_key = self._step_cache_key(step_data)
+        if cache_key is not None:
+            cached = self._step_cache.get(cache_key)
+            if cached is not None:
+                self._step_cache.move_to_end(cache_key)
+                return replace(cached, depends_on=list(cached.depends_on))
+
+        step = self._build_step(step_data, index)
+
+        if cache_key is not None:
+            if len(self._step_cache) >= self.STEP_CACHE_SIZE:
+                # Evict the least recently used entry
+                self._step_cache.popitem(last=False)
+            self._step_cache[cache_key] = step
+            step = replace(step, depends_on=list(step.depends_on))
+
+        return step
+
+    @staticmethod
+    def _step_cache_key(step_data: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Digest of the canonical JSON form of a step, or None if it can't be
+        cached
+
+        JSON turns non-string keys into strings ({1: 'x'} and {'1': 'x'} would
+        share a key), so steps containing them aren't cached.
+        """
+        if _has_non_str_keys(step_data):
+            return None
+        try:
+            canonical = json.dumps(step_data, sort_keys=True, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+    def _build_step(self, step_data: Dict[str, Any], index: int) -> WorkflowStep:
+        """Build and validate a single step"""
         if 'name' not in step_data:
             raise ValueError(f"Step {index + 1} must have a 'name' field")
 
@@ -127,6 +236,12 @@ class WorkflowParser:
         if on_error not in self.VALID_ERROR_ACTIONS:
             raise ValueError(f"Invalid on_error action: {on_error}")
 
+        # Canonicalize the HTTP method once so validation and executors
+        # can compare it directly
+        api_method = step_data.get('api_method')
+        if api_method:
+            api_method = str(api_method).upper()
+
         step = WorkflowStep(
             name=step_data['name'],
             type=step_type,
@@ -134,64 +249,30 @@ class WorkflowParser:
             command=step_data.get('command'),
             parser=step_data.get('parser'),
             output_var=step_data.get('output_var'),
-            depends_on=step_data.get('depends_on', []),
+            depends_on=list(step_data.get('depends_on', [])),
             condition=step_data.get('condition'),
             on_error=on_error,
-            vendor_specific=step_data.get('vendor_specific'),
+            vendor_specific=_read_only(step_data.get('vendor_specific')),
             template=step_data.get('template'),
-            template_vars=step_data.get('template_vars'),
+            template_vars=_read_only(step_data.get('template_vars')),
             script=step_data.get('script'),
             config_source=step_data.get('config_source'),
-            compare=step_data.get('compare'),
-            validation=step_data.get('validation'),
+            compare=_read_only(step_data.get('compare')),
+            validation=copy.deepcopy(step_data.get('validation')),
             # API call fields
             api_url=step_data.get('api_url'),
-            api_method=step_data.get('api_method'),
-            api_headers=step_data.get('api_headers'),
-            api_body=step_data.get('api_body'),
-            api_params=step_data.get('api_params'),
-            api_auth=step_data.get('api_auth'),
+            api_method=api_method,
+            api_headers=_read_only(step_data.get('api_headers')),
+            api_body=_read_only(step_data.get('api_body')),
+            api_params=_read_only(step_data.get('api_params')),
+            api_auth=_read_only(step_data.get('api_auth')),
             max_retries=step_data.get('max_retries', 0),
             retry_delay=step_data.get('retry_delay', 5),
             timeout=step_data.get('timeout')
         )
 
-        # Validate step-specific fields
-        self._validate_step(step)
-
         return step
 
-    def _validate_step(self, step: WorkflowStep):
-        """Validate step has required fields for its type"""
-        if step.type == 'query':
-            if not step.command and not step.vendor_specific:
-                raise ValueError(f"Query step '{step.name}' must have 'command' or 'vendor_specific'")
-
-        elif step.type == 'template':
-            if not step.template:
-                raise ValueError(f"Template step '{step.name}' must have 'template' field")
-
-        elif step.type == 'audit':
-            if not step.compare:
-                raise ValueError(f"Audit step '{step.name}' must have 'compare' field")
-
-        elif step.type == 'remediate':
-            if not step.config_source:
-                raise ValueError(f"Remediate step '{step.name}' must have 'config_source' field")
-
-        elif step.type == 'transform':
-            if not step.script:
-                raise ValueError(f"Transform step '{step.name}' must have 'script' field")
-
-        elif step.type == 'api_call':
-            if not step.api_url:
-                raise ValueError(f"API call step '{step.name}' must have 'api_url' field")
-            if not step.api_method:
-                raise ValueError(f"API call step '{step.name}' must have 'api_method' field")
-            valid_methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
-            if step.api_method.upper() not in valid_methods:
-                raise ValueError(f"API call step '{step.name}' has invalid method '{step.api_method}'. Must be one of: {valid_methods}")
-
     def _validate_workflow(self, workflow: WorkflowDefinition):
         """Validate workflow structure and dependencies"""
         step_names = {step.name for step in workflow.steps}
@@ -208,33 +289,39 @@ class WorkflowParser:
 
         # Check for circular dependencies (if DAG mode)
         if workflow.execution_mode in ['dag', 'hybrid']:
-            self._check_circular_dependencies(workflow.steps)
+            workflow.execution_waves = self._check_circular_dependencies(workflow.steps)
 
-    def _check_circular_dependencies(self, steps: List[WorkflowStep]):
-        """Check for circular dependencies in DAG"""
-        def has_cycle(step_name: str, visited: set, rec_stack: set) -> bool:
-            visited.add(step_name)
-            rec_stack.add(step_name)
-
-            step = next((s for s in steps if s.name == step_name), None)
-            if step:
-                for dep in step.depends_on:
-                    if dep not in visited:
-                        if has_cycle(dep, visited, rec_stack):
-                            return True
-                    elif dep in rec_stack:
-                        return True
-
-            rec_stack.remove(step_name)
-            return False
-
-        visited = set()
-        rec_stack = set()
+    def _check_circular_dependencies(self, steps: List[WorkflowStep]) -> List[List[str]]:
+        """
+        Check for circular dependencies in DAG using Kahn's algorithm
 
+        Returns:
+            Execution waves: lists of step names whose dependencies are all
+            satisfied by earlier waves
+        """
+        indegree = {step.name: len(step.depends_on) for step in steps}
+        dependents = {step.name: [] for step in steps}
         for step in steps:
-            if step.name not in visited:
-                if has_cycle(step.name, visited, rec_stack):
-                    raise ValueError(f"Circular dependency detected involving step '{step.name}'")
+            for dep in step.depends_on:
+                dependents[dep].append(step.name)
+
+        waves = []
+        wave = [step.name for step in steps if indegree[step.name] == 0]
+        while wave:
+            waves.append(wave)
+            next_wave = []
+            for step_name in wave:
+                for dependent in dependents[step_name]:
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        next_wave.append(dependent)
+            wave = next_wave
+
+        if sum(len(w) for w in waves) != len(steps):
+            blocked = next(step.name for step in steps if indegree[step.name] > 0)
+            raise ValueError(f"Circular dependency detected involving step '{blocked}'")
+
+        return waves
 
     def to_yaml(self, workflow: WorkflowDefinition) -> str:
         """Convert WorkflowDefinition back to YAML"""
@@ -268,20 +355,27 @@ class WorkflowParser:
             if step.on_error != 'fail':
                 step_dict['on_error'] = step.on_error
             if step.vendor_specific:
-                step_dict['vendor_specific'] = step.vendor_specific
+                step_dict['vendor_specific'] = dict(step.vendor_specific)
             if step.template:
                 step_dict['template'] = step.template
             if step.template_vars:
-                step_dict['template_vars'] = step.template_vars
+                step_dict['template_vars'] = dict(step.template_vars)
             if step.script:
                 step_dict['script'] = step.script
             if step.config_source:
                 step_dict['config_source'] = step.config_source
             if step.compare:
-                step_dict['compare'] = step.compare
+                step_dict['compare'] = dict(step.compare)
             if step.validation:
                 step_dict['validation'] = step.validation
 
             data['steps'].append(step_dict)
 
-        return yaml.dump(data, default_flow_style=False, sort_keys=False)
+        return yaml.dump(
+            data,
+            Dumper=_YamlDumper,
+            default_flow_style=None,
+            sort_keys=False,
+            allow_unicode=True,
+            width=120
+        )
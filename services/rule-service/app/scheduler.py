@@ -25,6 +25,7 @@ audit_schedule_service = AuditScheduleService()
 device_service = DeviceService()
 device_group_service = DeviceGroupService()
 rule_service = RuleService()
+audit_service = AuditService(AuditEngine())
 
 
 async def run_scheduled_audits():
@@ -59,8 +60,7 @@ async def run_scheduled_audits():
                     continue
 
                 # Get devices
-                devices = [device_service.get_device_by_id(db, did) for did in device_ids]
-                devices = [d for d in devices if d is not None]
+                devices = device_service.get_devices_by_ids(db, device_ids)
 
                 if not devices:
                     logger.warning(f"Audit schedule '{schedule.name}': no valid devices found")
@@ -69,8 +69,7 @@ async def run_scheduled_audits():
 
                 # Determine which rules to use
                 if schedule.rule_ids:
-                    rules = [rule_service.get_rule_by_id(db, rid) for rid in schedule.rule_ids]
-                    rules = [r for r in rules if r is not None]
+                    rules = rule_service.get_rules_by_ids(db, schedule.rule_ids)
                 else:
                     # Use all enabled rules
                     rules = rule_service.get_enabled_rules(db)
@@ -83,9 +82,7 @@ async def run_scheduled_audits():
                 logger.info(f"Running audit for schedule: {schedule.name} ({len(devices)} devices, {len(rules)} rules)")
 
                 # Run audit
-                audit_engine = AuditEngine()
-                audit_service_instance = AuditService(audit_engine)
-                await audit_service_instance.execute_audit(db, devices, rules)
+                await audit_service.execute_audit(db, devices, rules)
 
                 # Update timestamps
                 audit_schedule_service.update_run_timestamps(db, schedule.id)
@@ -6,6 +6,7 @@
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import or_
 from models.device import Device, DeviceCreate, DeviceUpdate
 from models.enums import DeviceStatus
 from db_models import DeviceDB
@@ -33,6 +34,12 @@ class DeviceService:
         db_device = db.query(DeviceDB).filter(DeviceDB.id == device_id).first()
         return self._to_pydantic(db_device) if db_device else None
 
+    def get_devices_by_ids(self, db: Session, device_ids: List[int]) -> List[Device]:
+        """Get devices by ID in one query, in the order given; missing IDs are skipped"""
+        ids = list(dict.fromkeys(device_ids))
+        db_devices = {d.id: d for d in db.query(DeviceDB).filter(DeviceDB.id.in_(ids))}
+        return [self._to_pydantic(db_devices[i]) for i in ids if i in db_devices]
+
     def get_device_by_hostname(self, db: Session, hostname: str) -> Optional[Device]:
         """Get device by hostname"""
         db_device = db.query(DeviceDB).filter(DeviceDB.hostname == hostname).first()
@@ -111,36 +118,48 @@ class DeviceService:
         logger.info(f"Deleted device ID: {device_id}")
         return True
 
+    @staticmethod
+    def _index_existing_devices(db: Session, discovered: List[Device]):
+        """Load every existing device matching a discovered IP or hostname in one query"""
+        ips = {d.ip for d in discovered if d.ip}
+        hostnames = {d.hostname for d in discovered}
+        existing = db.query(DeviceDB).filter(
+            or_(DeviceDB.ip.in_(ips), DeviceDB.hostname.in_(hostnames))
+        ).all()
+        return {d.ip: d for d in existing if d.ip}, {d.hostname: d for d in existing}
+
     def merge_discovered_devices(self, db: Session, discovered: List[Device]) -> int:
         """Merge discovered devices with existing ones"""
         added_count = 0
 
+        # One lookup for every candidate match instead of two or three queries per device
+        by_ip, by_hostname = self._index_existing_devices(db, discovered)
+
         for new_device in discovered:
             # First check if a device with this IP already exists (primary match)
-            existing_by_ip = None
-            if new_device.ip:
-                existing_by_ip = db.query(DeviceDB).filter(DeviceDB.ip == new_device.ip).first()
+            existing_by_ip = by_ip.get(new_device.ip) if new_device.ip else None
 
             # Also check by hostname
-            existing_by_hostname = db.query(DeviceDB).filter(DeviceDB.hostname == new_device.hostname).first()
+            existing_by_hostname = by_hostname.get(new_device.hostname)
 
             if existing_by_ip:
                 # Device with this IP exists - update it
                 if existing_by_ip.hostname != new_device.hostname:
                     # Hostname changed - need to handle UNIQUE constraint
                     # Check if another device already has the new hostname
-                    conflict_device = db.query(DeviceDB).filter(
-                        DeviceDB.hostname == new_device.hostname,
-                        DeviceDB.id != existing_by_ip.id
-                    ).first()
+                    conflict_device = existing_by_hostname if existing_by_hostname is not existing_by_ip else None
 
                     if conflict_device:
                         logger.info(f"Removing stale device '{conflict_device.hostname}' at {conflict_device.ip} (ID: {conflict_device.id}) - hostname now belongs to {new_device.ip}")
                         db.delete(conflict_device)
                         db.flush()  # Flush to release the hostname constraint
+                        if by_ip.get(conflict_device.ip) is conflict_device:
+                            del by_ip[conflict_device.ip]
 
                     logger.info(f"Hostname changed for device at {new_device.ip}: {existing_by_ip.hostname} -> {new_device.hostname}")
+                    by_hostname.pop(existing_by_ip.hostname, None)
                     existing_by_ip.hostname = new_device.hostname
+                    by_hostname[new_device.hostname] = existing_by_ip
 
                 # Update other fields that might have changed
                 existing_by_ip.vendor = new_device.vendor
@@ -153,7 +172,10 @@ class DeviceService:
             elif existing_by_hostname:
                 # Device with this hostname exists but different IP - update IP
                 logger.info(f"IP changed for device {new_device.hostname}: {existing_by_hostname.ip} -> {new_device.ip}")
+                if by_ip.get(existing_by_hostname.ip) is existing_by_hostname:
+                    del by_ip[existing_by_hostname.ip]
                 existing_by_hostname.ip = new_device.ip
+                by_ip[new_device.ip] = existing_by_hostname
                 existing_by_hostname.vendor = new_device.vendor
                 existing_by_hostname.port = new_device.port or 830
                 existing_by_hostname.username = new_device.username
@@ -30,6 +30,12 @@ class RuleService:
         db_rule = db.query(AuditRuleDB).filter(AuditRuleDB.id == rule_id).first()
         return self._to_pydantic(db_rule) if db_rule else None
 
+    def get_rules_by_ids(self, db: Session, rule_ids: List[int]) -> List[AuditRule]:
+        """Get rules by ID in one query, in the order given; missing IDs are skipped"""
+        ids = list(dict.fromkeys(rule_ids))
+        db_rules = {r.id: r for r in db.query(AuditRuleDB).filter(AuditRuleDB.id.in_(ids))}
+        return [self._to_pydantic(db_rules[i]) for i in ids if i in db_rules]
+
     def get_enabled_rules(self, db: Session) -> List[AuditRule]:
         """Get all enabled rules"""
         db_rules = db.query(AuditRuleDB).filter(AuditRuleDB.enabled == True).all()
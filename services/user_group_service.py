@@ -4,6 +4,7 @@
 # ============================================================================
 
 from typing import List, Optional, Set
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from datetime import datetime
@@ -276,24 +277,26 @@ class UserGroupService:
         # Check if superuser
         db_user = db.query(UserDB).filter(UserDB.id == user_id).first()
         if db_user and db_user.is_superuser:
-            return set(Permission.all_permissions())
+            return set(Permission.ALL)
 
         # Get user's groups
-        memberships = db.query(UserGroupMembershipDB).filter(
-            UserGroupMembershipDB.user_id == user_id
-        ).all()
-        group_ids = [m.group_id for m in memberships]
+        group_ids = [
+            group_id for (group_id,) in db.query(UserGroupMembershipDB.group_id).filter(
+                UserGroupMembershipDB.user_id == user_id
+            )
+        ]
 
         if not group_ids:
             return set()
 
         # Get all permissions from all groups
-        permissions = db.query(GroupPermissionDB).filter(
+        # Select only the names; the set dedupes across groups
+        permissions = db.query(GroupPermissionDB.permission).filter(
             GroupPermissionDB.group_id.in_(group_ids),
             GroupPermissionDB.granted == True
-        ).all()
+        )
 
-        return set(p.permission for p in permissions)
+        return {permission for (permission,) in permissions}
 
     def get_user_modules(self, db: Session, user_id: int) -> Set[str]:
         """
@@ -327,22 +330,23 @@ class UserGroupService:
             return license_modules
 
         # For regular users, get their group-based module access
-        memberships = db.query(UserGroupMembershipDB).filter(
-            UserGroupMembershipDB.user_id == user_id
-        ).all()
-        group_ids = [m.group_id for m in memberships]
+        group_ids = [
+            group_id for (group_id,) in db.query(UserGroupMembershipDB.group_id).filter(
+                UserGroupMembershipDB.user_id == user_id
+            )
+        ]
 
         if not group_ids:
             logger.debug(f"User {user_id} has no groups - no module access")
             return set()
 
         # Get all module access from all groups (these are also backend module names)
-        module_access = db.query(GroupModuleAccessDB).filter(
+        module_access = db.query(GroupModuleAccessDB.module_name).filter(
             GroupModuleAccessDB.group_id.in_(group_ids),
             GroupModuleAccessDB.can_access == True
-        ).all()
+        )
 
-        group_modules = set(m.module_name for m in module_access)
+        group_modules = {module_name for (module_name,) in module_access}
 
         # Intersect user's group modules with license-allowed modules
         # User can only access modules that are BOTH in their groups AND in the license
@@ -371,10 +375,12 @@ class UserGroupService:
             GroupPermissionDB.group_id == group_id
         ).delete()
 
-        # Add new permissions
-        for permission in permissions:
-            perm = GroupPermissionDB(group_id=group_id, permission=permission, granted=True)
-            db.add(perm)
+        # Add new permissions in one executemany INSERT
+        if permissions:
+            db.execute(insert(GroupPermissionDB), [
+                {"group_id": group_id, "permission": permission, "granted": True}
+                for permission in permissions
+            ])
 
         db.flush()
 
@@ -385,10 +391,12 @@ class UserGroupService:
             GroupModuleAccessDB.group_id == group_id
         ).delete()
 
-        # Add new module access
-        for module in modules:
-            access = GroupModuleAccessDB(group_id=group_id, module_name=module, can_access=True)
-            db.add(access)
+        # Add new module access in one executemany INSERT
+        if modules:
+            db.execute(insert(GroupModuleAccessDB), [
+                {"group_id": group_id, "module_name": module, "can_access": True}
+                for module in modules
+            ])
 
         db.flush()
 
@@ -413,7 +421,8 @@ class UserGroupService:
             UserGroupMembershipDB.group_id == db_group.id
         ).count()
 
-        return UserGroup(
+        # Rows are already typed by the ORM, so skip re-validation on reads
+        return UserGroup.model_construct(
             id=db_group.id,
             name=db_group.name,
             description=db_group.description,
@@ -443,7 +452,9 @@ class UserGroupService:
         permissions = list(self.get_user_permissions(db, db_user.id))
         modules = list(self.get_user_modules(db, db_user.id))
 
-        return User(
+        # Rows are already typed by the ORM (and the email was validated on
+        # write), so skip re-validation on reads
+        return User.model_construct(
             id=db_user.id,
             username=db_user.username,
             email=db_user.email,
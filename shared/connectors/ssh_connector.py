@@ -4,6 +4,7 @@
 # ============================================================================
 
 import paramiko
+import socket
 import time
 import re
 from models.device import Device
@@ -54,22 +55,24 @@ def get_nokia_sros_config_sync(host: str, port: int, username: str, password: st
         time.sleep(2)
 
         output = []
-        last = time.time()
 
+        # Block on each read so data is picked up as soon as it arrives;
+        # no data for 2 seconds means the device has finished
+        chan.settimeout(2)
         while True:
-            if chan.recv_ready():
-                chunk = chan.recv(65535).decode(errors="ignore")
-                output.append(chunk)
-                last = time.time()
-
-                # Check for SROS prompt: A:router> or similar
-                if "A:" in chunk and (">" in chunk or "#" in chunk):
-                    break
-            else:
-                # If no data for 2 seconds consider finished
-                if time.time() - last > 2:
-                    break
-                time.sleep(0.2)
+            try:
+                data = chan.recv(65535)
+            except socket.timeout:
+                break
+            if not data:
+                break
+
+            chunk = data.decode(errors="ignore")
+            output.append(chunk)
+
+            # Check for SROS prompt: A:router> or similar
+            if "A:" in chunk and (">" in chunk or "#" in chunk):
+                break
 
         ssh.close()
 
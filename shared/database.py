@@ -1,3 +1,4 @@
+import json
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -6,22 +7,48 @@ from shared.config import settings
 SQLALCHEMY_DATABASE_URL = settings.database_url or "sqlite:///./network_audit.db"
 
 # Configure connection pool settings for production
-pool_config = {}
 if "sqlite" in SQLALCHEMY_DATABASE_URL:
-    # SQLite-specific settings
-    pool_config = {"check_same_thread": False}
+    # SQLite-specific settings; SQLite picks its own pool class, which
+    # doesn't accept the sizing arguments below
+    engine_config = {"connect_args": {"check_same_thread": False}}
 else:
     # PostgreSQL/Production settings
-    pool_config = {}
+    engine_config = {
+        "pool_size": settings.db_pool_size,        # Connections kept open
+        "max_overflow": settings.db_max_overflow,  # Overflow connections beyond pool_size
+        "pool_timeout": settings.db_pool_timeout,  # Seconds to wait for a free connection
+        "pool_recycle": settings.db_pool_recycle,  # Recycle connections after this many seconds
+        "pool_pre_ping": settings.db_pool_pre_ping,  # Verify connections before using them
+        "pool_use_lifo": True,                     # Reuse the most recent connection; lets idle ones time out
+    }
+
+# Prefer orjson for writing JSON columns, fall back to SQLAlchemy's stdlib
+# encoder. Reads stay on the stdlib json.loads, which also accepts the
+# NaN/Infinity tokens older rows may hold (orjson.loads rejects them).
+# orjson writes non-finite floats as null; see
+# migrations/null_non_finite_json_floats.py for existing rows.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(value) -> str:
+    """Serialize a JSON column value, using the stdlib for what orjson rejects"""
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        # e.g. integers wider than 64 bits, which the stdlib round-trips
+        return json.dumps(value)
+
+
+if orjson is not None:
+    engine_config["json_serializer"] = _dump_json
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_size=10,              # Maximum number of connections to keep open
-    max_overflow=20,           # Maximum overflow connections beyond pool_size
-    pool_pre_ping=True,        # Verify connections before using them
-    pool_recycle=3600,         # Recycle connections after 1 hour
     echo=False,                # Set to True for SQL debugging
-    connect_args=pool_config
+    **engine_config
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
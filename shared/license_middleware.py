@@ -290,7 +290,8 @@ class LicenseEnforcer:
             if 'sqlite' in db_url:
                 # Extract database path from SQLite URL
                 db_path = db_url.replace('sqlite:///', '').replace('sqlite://', '')
-                if db_path and os.path.exists(db_path):
+                if db_path:
+                    # A single stat; a missing file raises OSError below
                     db_file_size = os.path.getsize(db_path)
                     # Use actual file size if larger than calculated
                     if db_file_size > total_bytes:
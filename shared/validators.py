@@ -156,6 +156,11 @@ def validate_ip(ip: str) -> bool:
         return False
     return all(0 <= int(octet) <= 255 for octet in ip.split('.'))
 
+# A JSON string literal, or a comma followed (after any whitespace) by a
+# closing brace/bracket
+_TRAILING_COMMA_RE = re.compile(r'"(?:[^"\\]|\\.)*"|,(?=\s*[}\]])')
+
+
 def validate_and_fix_json(json_str: str, auto_fix: bool = True) -> Tuple[bool, Optional[Union[dict, list]], Optional[str]]:
     """
     Validate JSON string and optionally attempt to fix common issues
@@ -184,36 +189,10 @@ def validate_and_fix_json(json_str: str, auto_fix: bool = True) -> Tuple[bool, O
             return False, None, str(e)
     
     # Attempt fixes
-    fixed_json = json_str
-    
-    # Fix 1: Remove trailing commas before closing braces/brackets
-    fixed_json = re.sub(r',(\s*[}\]])', r'\1', fixed_json)
-    
-    # Fix 2: Remove trailing commas at end of lines before closing braces/brackets
-    lines = fixed_json.split('\n')
-    fixed_lines = []
-    
-    for i, line in enumerate(lines):
-        stripped_line = line.rstrip()
-        
-        # Check if line ends with comma
-        if stripped_line.endswith(','):
-            # Look ahead to see if next non-empty line starts with } or ]
-            next_is_closing = False
-            for j in range(i + 1, len(lines)):
-                next_stripped = lines[j].strip()
-                if next_stripped:
-                    if next_stripped[0] in ('}', ']'):
-                        next_is_closing = True
-                    break
-            
-            # Remove trailing comma if next line is closing bracket
-            if next_is_closing:
-                stripped_line = stripped_line[:-1]
-        
-        fixed_lines.append(stripped_line if stripped_line != line.rstrip() else line)
-    
-    fixed_json = '\n'.join(fixed_lines)
+    # Remove trailing commas before closing braces/brackets, across lines too.
+    # String literals are matched first and kept as-is, so commas inside
+    # strings (e.g. "a,]") are left alone
+    fixed_json = _TRAILING_COMMA_RE.sub(lambda m: '' if m.group(0) == ',' else m.group(0), json_str)
     
     # Try parsing the fixed JSON
     try:
@@ -0,0 +1,147 @@
+# ============================================================================
+# tests/test_api_gateway.py - API gateway proxy tests
+# ============================================================================
+
+import gzip
+import importlib.util
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+GATEWAY_MAIN = Path(__file__).resolve().parent.parent / "services" / "api-gateway" / "app" / "main.py"
+
+
+def _load_gateway():
+    """Load the gateway app under its own module name (root main.py is 'main')"""
+    spec = importlib.util.spec_from_file_location("api_gateway_main", GATEWAY_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gateway = _load_gateway()
+
+
+class TrackedStream(httpx.AsyncByteStream):
+    """Upstream response body that records whether it was closed"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _stream_response(status_code, body=b"", headers=None) -> httpx.Response:
+    """Upstream response with an unread body, as a real transport returns it
+
+    httpx.Response(content=...) is pre-read, which aiter_raw() refuses.
+    """
+    return httpx.Response(status_code, headers=headers, stream=TrackedStream([body]))
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the gateway's HTTP client to a mock upstream; yields the request log"""
+    seen = {"requests": [], "handler": None}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        seen["requests"].append(request)
+        return seen["handler"](request)
+
+    monkeypatch.setattr(
+        gateway, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    )
+    return seen
+
+
+@pytest.fixture
+def client():
+    return TestClient(gateway.app)
+
+
+class TestProxyRequest:
+    """Test streaming request/response forwarding"""
+
+    def test_post_body_arrives_intact(self, upstream, client):
+        """A request body is streamed upstream unchanged"""
+        body = b'{"hostname": "r1"}' * 5000
+        upstream["handler"] = lambda request: _stream_response(201, b"created")
+
+        response = client.post("/devices", content=body, headers={"Content-Type": "application/json"})
+
+        assert response.status_code == 201
+        assert response.content == b"created"
+        sent = upstream["requests"][0]
+        assert sent.method == "POST"
+        assert str(sent.url) == "http://device-service:3001/devices/"
+        assert sent.content == body
+
+    def test_hop_by_hop_headers_stripped_both_ways(self, upstream, client):
+        """Connection-level headers are dropped; end-to-end headers pass through"""
+        upstream["handler"] = lambda request: _stream_response(
+            200,
+            b"ok",
+            headers={"Keep-Alive": "timeout=5", "Proxy-Authenticate": "Basic", "X-Upstream": "1"},
+        )
+
+        response = client.get(
+            "/devices/1",
+            headers={"Keep-Alive": "timeout=5", "Proxy-Authorization": "Basic abc", "X-Request-Id": "42"},
+        )
+
+        sent = upstream["requests"][0]
+        assert sent.headers["x-request-id"] == "42"
+        assert "proxy-authorization" not in sent.headers
+        assert "keep-alive" not in sent.headers
+        assert sent.headers["host"] == "device-service:3001"
+
+        assert response.headers["x-upstream"] == "1"
+        assert "proxy-authenticate" not in response.headers
+        assert "keep-alive" not in response.headers
+
+    def test_no_content_returns_empty_body(self, upstream, client):
+        """A 204 from upstream is returned without a body"""
+        upstream["handler"] = lambda request: httpx.Response(204)
+
+        response = client.delete("/devices/1")
+
+        assert response.status_code == 204
+        assert response.content == b""
+
+    def test_gzip_body_passed_through_undecoded(self, upstream, client):
+        """Compressed upstream bodies are forwarded as-is with their encoding header"""
+        payload = b'{"devices": []}' * 100
+        compressed = gzip.compress(payload)
+        upstream["handler"] = lambda request: _stream_response(
+            200, compressed, headers={"Content-Encoding": "gzip"}
+        )
+
+        with client.stream("GET", "/devices") as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert raw == compressed
+
+    def test_upstream_response_closed_after_streaming(self, upstream, client):
+        """The upstream response is closed once its body has been relayed"""
+        streams = []
+
+        def handler(request):
+            stream = TrackedStream([b"part1-", b"part2"])
+            streams.append(stream)
+            return httpx.Response(200, stream=stream)
+
+        upstream["handler"] = handler
+
+        response = client.get("/devices")
+
+        assert response.content == b"part1-part2"
+        assert streams[0].closed
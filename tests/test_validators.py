@@ -3,6 +3,8 @@
 # ============================================================================
 
 import pytest
+from shared import validators as shared_validators
+from utils import validators as utils_validators
 from shared.validators import (
     validate_hostname,
     validate_ip,
@@ -216,3 +218,41 @@ class TestSanitization:
         long_string = "x" * 2000
         sanitized = sanitize_string(long_string, max_length=100)
         assert len(sanitized) == 100
+
+
+@pytest.fixture(params=[shared_validators, utils_validators], ids=["shared", "utils"])
+def validate_and_fix_json(request):
+    """Both copies of validate_and_fix_json must behave the same"""
+    return request.param.validate_and_fix_json
+
+
+class TestJSONTrailingCommaFix:
+    """Test trailing-comma repair in validate_and_fix_json"""
+
+    def test_trailing_comma_in_array(self, validate_and_fix_json):
+        assert validate_and_fix_json("[1,2,]") == (True, [1, 2], None)
+
+    def test_trailing_comma_in_object_with_spaces(self, validate_and_fix_json):
+        assert validate_and_fix_json('{"a":1 , }') == (True, {"a": 1}, None)
+
+    def test_comma_inside_string_untouched(self, validate_and_fix_json):
+        """Only commas outside string literals are removed"""
+        assert validate_and_fix_json('["a,]", "b, }",]') == (True, ["a,]", "b, }"], None)
+        assert validate_and_fix_json('{"k": "say \\"x,]\\"",}') == (True, {"k": 'say "x,]"'}, None)
+
+    def test_nested_containers(self, validate_and_fix_json):
+        fixed = validate_and_fix_json('{"a": [1, {"b": [2,],},], "c": {"d": 3,},}')
+        assert fixed == (True, {"a": [1, {"b": [2]}], "c": {"d": 3}}, None)
+
+    def test_trailing_comma_across_lines(self, validate_and_fix_json):
+        text = '{\n  "a": [\n    1,\n\n  ],\n  "b": 2,\n\n}'
+        assert validate_and_fix_json(text) == (True, {"a": [1], "b": 2}, None)
+
+    def test_unfixable_json_reports_error(self, validate_and_fix_json):
+        is_valid, parsed, error = validate_and_fix_json('{"a": 1 "b": 2}')
+        assert not is_valid and parsed is None
+        assert error.startswith("Could not fix JSON")
+
+    def test_no_auto_fix(self, validate_and_fix_json):
+        is_valid, parsed, _ = validate_and_fix_json("[1,]", auto_fix=False)
+        assert not is_valid and parsed is None
@@ -0,0 +1,112 @@
+# ============================================================================
+# tests/test_workflow_parser.py - Workflow parser tests
+# ============================================================================
+
+import pytest
+from engine.workflow_parser import WorkflowParser
+
+
+class TestStepCache:
+    """Test the parsed step cache"""
+
+    def test_repeated_step_returns_equal_independent_copy(self):
+        """A cached step is returned as a copy that can't leak mutations back"""
+        parser = WorkflowParser()
+        step_data = {"name": "show", "type": "query", "command": "show version", "depends_on": ["login"]}
+
+        first = parser._parse_step(step_data, 0)
+        second = parser._parse_step(step_data, 0)
+
+        assert first == second
+        assert first is not second
+
+        second.depends_on.append("extra")
+        step_data["depends_on"].append("also-extra")
+        third = parser._parse_step({"name": "show", "type": "query", "command": "show version",
+                                    "depends_on": ["login"]}, 0)
+        assert third.depends_on == ["login"]
+        assert first.depends_on == ["login"]
+
+    def test_nested_caller_mutation_does_not_leak(self):
+        """Changing the caller's nested data after parsing doesn't reach the cache"""
+        parser = WorkflowParser()
+
+        def make_step():
+            return {"name": "show", "type": "query", "vendor_specific": {"nokia": {"cmd": "a"}},
+                    "validation": [{"expect": "up"}]}
+
+        step_data = make_step()
+        parser._parse_step(step_data, 0)
+        step_data["vendor_specific"]["nokia"]["cmd"] = "MUT"
+        step_data["validation"][0]["expect"] = "MUT"
+
+        cached = parser._parse_step(make_step(), 0)
+        assert cached.vendor_specific["nokia"] == {"cmd": "a"}
+        assert cached.validation == [{"expect": "up"}]
+
+    def test_non_string_keys_are_not_conflated(self):
+        """{1: 'x'} and {'1': 'x'} are different steps"""
+        parser = WorkflowParser()
+        int_keys = {"name": "t", "type": "template", "template": "x", "template_vars": {1: "x"}}
+        str_keys = {"name": "t", "type": "template", "template": "x", "template_vars": {"1": "x"}}
+
+        assert dict(parser._parse_step(int_keys, 0).template_vars) == {1: "x"}
+        assert dict(parser._parse_step(str_keys, 0).template_vars) == {"1": "x"}
+
+    def test_hit_refreshes_recency(self):
+        """Recently used steps survive eviction (LRU, not FIFO)"""
+        parser = WorkflowParser()
+        parser.STEP_CACHE_SIZE = 2
+        hot = {"name": "hot", "type": "query", "command": "show clock"}
+
+        parser._parse_step(hot, 0)
+        parser._parse_step({"name": "a", "type": "query", "command": "a"}, 1)
+        parser._parse_step(hot, 0)
+        parser._parse_step({"name": "b", "type": "query", "command": "b"}, 2)
+
+        assert parser._step_cache_key(hot) in parser._step_cache
+        assert len(parser._step_cache) == 2
+
+
+def _dag_yaml(steps: str) -> str:
+    return "name: wf\nexecution_mode: dag\nsteps:\n" + steps
+
+
+class TestExecutionWaves:
+    """Test DAG dependency levels computed at parse time"""
+
+    def test_diamond_dag_waves(self):
+        """Both branches of a diamond share a wave between the root and the join"""
+        workflow = WorkflowParser().parse(_dag_yaml(
+            "  - {name: a, type: query, command: x}\n"
+            "  - {name: b, type: query, command: x, depends_on: [a]}\n"
+            "  - {name: c, type: query, command: x, depends_on: [a]}\n"
+            "  - {name: d, type: query, command: x, depends_on: [b, c]}\n"
+        ))
+
+        assert workflow.execution_waves == [["a"], ["b", "c"], ["d"]]
+
+    def test_sequential_mode_has_no_waves(self):
+        """Waves are only computed for dag/hybrid workflows"""
+        workflow = WorkflowParser().parse(
+            "name: wf\nsteps:\n  - {name: a, type: query, command: x}\n"
+        )
+
+        assert workflow.execution_waves == []
+
+    def test_cycle_raises(self):
+        """Circular dependencies are still rejected"""
+        with pytest.raises(ValueError, match="Circular dependency"):
+            WorkflowParser().parse(_dag_yaml(
+                "  - {name: a, type: query, command: x, depends_on: [c]}\n"
+                "  - {name: b, type: query, command: x, depends_on: [a]}\n"
+                "  - {name: c, type: query, command: x, depends_on: [b]}\n"
+            ))
+
+    def test_unknown_dependency_raises(self):
+        """A depends_on naming a missing step is rejected before ordering"""
+        with pytest.raises(ValueError, match="non-existent step 'missing'"):
+            WorkflowParser().parse(_dag_yaml(
+                "  - {name: a, type: query, command: x}\n"
+                "  - {name: b, type: query, command: x, depends_on: [a, missing]}\n"
+            ))
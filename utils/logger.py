@@ -8,6 +8,10 @@ import os
 from logging.handlers import RotatingFileHandler
 from config import settings
 
+# Log directories already created by this process, so each new logger
+# doesn't issue another mkdir
+_created_log_dirs = set()
+
 def setup_logger(name: str) -> logging.Logger:
     """Setup logger with consistent formatting and file output"""
     logger = logging.getLogger(name)
@@ -19,10 +23,12 @@ def setup_logger(name: str) -> logging.Logger:
         logger.setLevel(getattr(logging, settings.log_level.upper()))
 
     if not logger.handlers:
-        # Create logs directory if it doesn't exist
+        # Create logs directory if it doesn't exist (exist_ok makes a
+        # separate exists() stat redundant)
         log_dir = os.path.dirname(settings.log_file)
-        if log_dir and not os.path.exists(log_dir):
+        if log_dir and log_dir not in _created_log_dirs:
             os.makedirs(log_dir, exist_ok=True)
+            _created_log_dirs.add(log_dir)
 
         # Formatter
         formatter = logging.Formatter(